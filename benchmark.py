@@ -0,0 +1,308 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import dcop
+import generator
+from exact import solve_exact
+from online import schedule_quality
+from pydcop_runner import PydcopRunner
+from schedule import Schedule
+from validation import validate_solution
+
+STUB_PYDCOP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_pydcop.py")
+
+
+def baseline_first_slot(o, instance, R):
+    """
+    first_slot de la version initiale (99fe25f), sur un plan {satellite_id: [(o, (satellite_id, t))]}
+    parcouru depuis le début.
+    """
+    satellite = o.satellite_o
+    if len(R[satellite.id]) < satellite.capacity:
+        if not R[satellite.id]:
+            if o.t_end_o >= o.t_start_o + o.duration_o:
+                R[satellite.id].append((o, (satellite.id, o.t_start_o)))
+                return (satellite.id, o.t_start_o)
+        else:
+            i = 0
+            while i <= len(R[satellite.id]):
+                t_start_prime = o.t_start_o
+                if i > 0:
+                    observation_prev, (_, t_prev) = R[satellite.id][i - 1]
+                    t_start_prime = max(o.t_start_o, t_prev + observation_prev.duration_o + satellite.transition_time)
+                if t_start_prime + o.duration_o <= o.t_end_o:
+                    if i == len(R[satellite.id]):
+                        t_upper = o.t_end_o
+                        t_end_prime = t_start_prime + o.duration_o
+                    else:
+                        obs, (_, t_i) = R[satellite.id][i]
+                        t_upper = t_i
+                        t_end_prime = t_start_prime + o.duration_o + satellite.transition_time
+                    if t_start_prime < t_end_prime <= t_upper:
+                        R[satellite.id].insert(i, (o, (satellite.id, t_start_prime)))
+                        return (satellite.id, t_start_prime)
+                i += 1
+
+    return None
+
+
+def baseline_greedy_solver(instance, R, first_slot=baseline_first_slot):
+    """
+    Boucle gloutonne de la version initiale (99fe25f), conservée telle quelle comme
+    référence de temps : O_sorted est reconstruite après chaque affectation réussie,
+    mais la boucle continue sur l'ancienne liste, si bien qu'une requête peut
+    recevoir plusieurs observations.
+
+    Args:
+        first_slot (callable): baseline_first_slot (plan en listes, comme à l'origine)
+            ou dcop.first_slot (plan Schedule), pour isoler le coût de la boucle.
+    """
+    M = {}
+    O_sorted = dcop.sort_observations(instance.observation_opportunities)
+
+    for o in O_sorted:
+        t = first_slot(o, instance, R)
+        if t != None:
+            M[o] = t
+            O_sorted = [op for op in O_sorted if op.request_o != o.request_o]
+
+    return M
+
+
+def time_greedy(solver, instance, R):
+    t0 = time.perf_counter()
+    M = solver(instance, R)
+    return time.perf_counter() - t0, M
+
+
+def benchmark_greedy(tasks_per_user_values=(20, 50, 100, 200, 400), num_satellites=5, num_exclusive_users=4, seed=0):
+    """
+    Compare la boucle gloutonne groupée par requête à la boucle initiale.
+
+    Trois temps sont mesurés : la version initiale complète (boucle et first_slot
+    linéaire), la boucle initiale sur le plan Schedule actuel, qui isole le coût de
+    la boucle, et la boucle actuelle. Les deux boucles ne donnent pas la même
+    allocation : le nombre d'observations et de requêtes servies de chacune est
+    reporté à part.
+
+    Args:
+        tasks_per_user_values (iterable): Valeurs de num_tasks_per_user à tester.
+        num_satellites (int): Nombre de satellites de chaque instance.
+        num_exclusive_users (int): Nombre d'utilisateurs exclusifs.
+        seed (int): Graine du générateur aléatoire.
+
+    Returns:
+        list: Une ligne (dict) par valeur de num_tasks_per_user.
+    """
+    rows = []
+    for num_tasks_per_user in tasks_per_user_values:
+        random.seed(seed)
+        instance = generator.Instance.generate(num_satellites, num_exclusive_users, num_tasks_per_user)
+        baseline_time, baseline_M = time_greedy(baseline_greedy_solver, instance,
+                                                {satellite.id: [] for satellite in instance.satellites})
+        baseline_loop_time, baseline_loop_M = time_greedy(
+            lambda instance, R: baseline_greedy_solver(instance, R, dcop.first_slot), instance, Schedule(instance.satellites))
+        if baseline_loop_M != baseline_M:
+            raise RuntimeError(f"first_slot diverge de la version initiale pour num_tasks_per_user={num_tasks_per_user}")
+        grouped_time, grouped_M = time_greedy(dcop.greedy_eoscsp_solver, instance, Schedule(instance.satellites))
+        rows.append({
+            "num_tasks_per_user": num_tasks_per_user,
+            "num_observations": len(instance.observation_opportunities),
+            "baseline_time": baseline_time,
+            "baseline_loop_time": baseline_loop_time,
+            "grouped_time": grouped_time,
+            "loop_speedup": baseline_loop_time / grouped_time if grouped_time > 0 else float("inf"),
+            "speedup": baseline_time / grouped_time if grouped_time > 0 else float("inf"),
+            "baseline_assigned": len(baseline_M),
+            "baseline_served": len({o.request_o for o in baseline_M}),
+            "grouped_assigned": len(grouped_M),
+            "grouped_served": len({o.request_o for o in grouped_M}),
+        })
+    return rows
+
+
+def measure(call):
+    """
+    Mesure une phase : temps d'exécution, puis pic mémoire (tracemalloc) lors d'une
+    seconde exécution, pour que le traçage ne fausse pas le temps mesuré.
+
+    Args:
+        call (callable): Phase à mesurer, sans argument et sans effet de bord.
+
+    Returns:
+        tuple: (résultat, temps en secondes, pic mémoire en octets).
+    """
+    t0 = time.perf_counter()
+    result = call()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def solution_quality(solution):
+    """
+    Retourne (récompense totale, nombre de requêtes servies) d'une solution {observation: créneau}.
+    """
+    return sum(o.reward_o for o in solution), len({o.request_o for o in solution})
+
+
+def make_backend(backend):
+    # 'stub' : chemin pydcop complet (YAML, sous-processus, JSON) sans installation de pydcop
+    if backend == 'stub':
+        return PydcopRunner([sys.executable, STUB_PYDCOP])
+    return backend
+
+
+def greedy_phases(instance):
+    # Étapes 1 et 2 du solveur s-DCOP : planificateur central puis utilisateurs exclusifs
+    R = Schedule(instance.satellites)
+    M = dcop.greedy_eoscsp_solver(instance.filter_by_user("central_planner"), R)
+    for user in instance.users:
+        if user.exclusive_windows:
+            M.update(dcop.greedy_eoscsp_solver(instance.filter_by_user(user.id), R))
+    return R, M
+
+
+def benchmark_instance(instance, algorithm='dpop', backend='native', exact_time_limit=None):
+    """
+    Mesure chaque phase du solveur s-DCOP sur une instance.
+
+    Les DCOP des phases build_DCOP_yaml et solve_DCOP sont ceux des requêtes restées
+    non assignées après les phases gloutonnes, tous construits sur ce même plan.
+    Si exact_time_limit est donné, la récompense du plan complet est comparée à
+    celle du solveur exact (exact.solve_exact), qui sert de référence.
+
+    Returns:
+        dict: Temps (s), pics mémoire (octets) et qualité de chaque phase.
+    """
+    backend = make_backend(backend)
+    row = {"num_observations": len(instance.observation_opportunities)}
+
+    (_, M), row["greedy_time"], row["greedy_memory"] = measure(lambda: greedy_phases(instance))
+    row["greedy_reward"], row["greedy_served"] = solution_quality(M)
+
+    R, _ = greedy_phases(instance)
+    requests = dcop.sort_requests([r for r in instance.tasks if not R.is_served(r)])
+    exclusive_windows = instance.exclusive_window_index
+    row["num_dcops"] = len(requests)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, f"dcop_{i}.yaml") for i in range(len(requests))]
+
+        def build_all():
+            for r, path in zip(requests, paths):
+                dcop.build_DCOP_yaml(r.observation_opportunities, R, exclusive_windows, path)
+
+        _, row["build_DCOP_yaml_time"], row["build_DCOP_yaml_memory"] = measure(build_all)
+        _, row["solve_DCOP_time"], row["solve_DCOP_memory"] = measure(
+            lambda: [dcop.solve_DCOP(path, algorithm, backend) for path in paths])
+
+    solution, row["end_to_end_time"], row["end_to_end_memory"] = measure(
+        lambda: dcop.s_dcop_eoscsp_solver(instance, algorithm, backend))
+    row["reward"], row["served"] = solution_quality(solution)
+    row["violations"] = sum(len(rows) for rows in validate_solution(solution, instance).values())
+
+    if exact_time_limit is not None:
+        R = dcop.s_dcop_schedule(instance, algorithm, backend)
+        row["schedule_served"], row["schedule_reward"] = schedule_quality(R)
+        _, stats = solve_exact(instance, time_limit=exact_time_limit, incumbent=R)
+        row["exact_reward"] = stats["reward"]
+        row["exact_upper_bound"] = stats["upper_bound"]
+        row["exact_optimal"] = stats["optimal"]
+        row["exact_time"] = stats["time"]
+        row["optimality_gap"] = (stats["upper_bound"] - row["schedule_reward"]) / stats["upper_bound"] if stats["upper_bound"] else 0.0
+    return row
+
+
+def benchmark_scaling(num_satellites_values=(5, 10), num_exclusive_users_values=(2, 4),
+                      tasks_per_user_values=(20, 50), seeds=(0, 1, 2), algorithm='dpop', backend='native',
+                      exact_time_limit=None):
+    """
+    Balaye une grille de tailles d'instances, avec des graines fixes.
+
+    Args:
+        num_satellites_values (iterable): Valeurs de num_satellites.
+        num_exclusive_users_values (iterable): Valeurs de num_exclusive_users.
+        tasks_per_user_values (iterable): Valeurs de num_tasks_per_user.
+        seeds (iterable): Graines ; une instance est générée par graine et par point de la grille.
+        algorithm (str): Algorithme DCOP.
+        backend (str): 'native', 'stub' (faux exécutable pydcop) ou 'pydcop'.
+        exact_time_limit (float): Si donné, durée maximale du solveur exact de référence par instance.
+
+    Returns:
+        list: Une ligne (dict) par instance.
+    """
+    rows = []
+    grid = itertools.product(num_satellites_values, num_exclusive_users_values, tasks_per_user_values, seeds)
+    for num_satellites, num_exclusive_users, num_tasks_per_user, seed in grid:
+        random.seed(seed)
+        instance = generator.Instance.generate(num_satellites, num_exclusive_users, num_tasks_per_user)
+        row = {
+            "num_satellites": num_satellites,
+            "num_exclusive_users": num_exclusive_users,
+            "num_tasks_per_user": num_tasks_per_user,
+            "seed": seed,
+            "algorithm": algorithm,
+            "backend": backend,
+        }
+        row.update(benchmark_instance(instance, algorithm, backend, exact_time_limit))
+        rows.append(row)
+    return rows
+
+
+def write_results(rows, path):
+    """
+    Écrit les lignes d'un benchmark en CSV ou en JSON, selon l'extension de path.
+    """
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(rows, f, indent=2)
+        return path
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks du solveur s-DCOP EOSCSP")
+    parser.add_argument("--greedy", action="store_true", help="Comparer uniquement les deux boucles gloutonnes")
+    parser.add_argument("--satellites", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--users", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[20, 50])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--algorithm", default="dpop")
+    parser.add_argument("--backend", default="native", choices=["native", "stub", "pydcop"])
+    parser.add_argument("--exact-time-limit", type=float, default=None,
+                        help="Comparer au solveur exact, avec cette durée maximale (s) par instance")
+    parser.add_argument("--output", default="benchmark_results.csv", help="Fichier .csv ou .json")
+    args = parser.parse_args()
+
+    if args.greedy:
+        for row in benchmark_greedy():
+            print(f"{row['num_tasks_per_user']:>5} tâches/utilisateur, {row['num_observations']:>6} observations : "
+                  f"{row['baseline_time']:.4f}s (boucle seule {row['baseline_loop_time']:.4f}s) -> {row['grouped_time']:.4f}s "
+                  f"(x{row['speedup']:.1f}, boucle x{row['loop_speedup']:.1f})")
+            print(f"      observations affectées {row['baseline_assigned']} -> {row['grouped_assigned']}, "
+                  f"requêtes servies {row['baseline_served']} -> {row['grouped_served']}")
+    else:
+        rows = benchmark_scaling(args.satellites, args.users, args.tasks, args.seeds, args.algorithm, args.backend,
+                                 args.exact_time_limit)
+        for row in rows:
+            print(f"{row['num_satellites']:>3} satellites, {row['num_exclusive_users']:>3} utilisateurs, "
+                  f"{row['num_tasks_per_user']:>4} tâches/utilisateur (graine {row['seed']}) : "
+                  f"{row['end_to_end_time']:.3f}s, récompense {row['reward']}, {row['served']} requêtes servies")
+        print(f"Résultats écrits dans {write_results(rows, args.output)}")
@@ -0,0 +1,492 @@
+import numpy as np
+
+import generator
+
+TOTAL_TIME = 300
+OPPORTUNITIES_PER_TASK = 10
+
+
+class OpportunityView:
+    """
+    Vue légère sur une opportunité d'un OpportunityStore, avec les mêmes attributs
+    que generator.ObservationOpportunity.
+    """
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store, i):
+        self._store = store
+        self._i = i
+
+    def __eq__(self, other):
+        return (isinstance(other, OpportunityView) and self._store.root is other._store.root
+                and self._store.index[self._i] == other._store.index[other._i])
+
+    def __hash__(self):
+        return hash(int(self._store.index[self._i]))
+
+    def __repr__(self):
+        return f"<OpportunityView {self.id}>"
+
+    @property
+    def index(self):
+        return int(self._store.index[self._i])
+
+    @property
+    def id(self):
+        return f"obs_{self._store.index[self._i] + 1}"
+
+    @property
+    def t_start_o(self):
+        return float(self._store.t_start[self._i])
+
+    @property
+    def t_end_o(self):
+        return float(self._store.t_end[self._i])
+
+    @property
+    def duration_o(self):
+        return float(self._store.duration[self._i])
+
+    @property
+    def reward_o(self):
+        return int(self._store.reward[self._i])
+
+    @property
+    def priority_o(self):
+        return int(self._store.priority[self._i])
+
+    @property
+    def request_o(self):
+        return self._store.requests[self._store.request[self._i]]
+
+    @property
+    def satellite_o(self):
+        return self._store.satellites[self._store.satellite[self._i]]
+
+    @property
+    def user_o(self):
+        return self._store.users[self._store.user[self._i]]
+
+
+class OpportunitySlice:
+    """
+    Opportunités contiguës d'un store (celles d'une même tâche), vues comme une liste.
+    """
+
+    __slots__ = ("_store", "_start", "_stop")
+
+    def __init__(self, store, start, stop):
+        self._store = store
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return OpportunityView(self._store, self._start + i)
+
+    def __iter__(self):
+        for i in range(self._start, self._stop):
+            yield OpportunityView(self._store, i)
+
+
+class OpportunityStore:
+    """
+    Opportunités d'observation rangées en colonnes NumPy.
+
+    Les références vers les satellites, requêtes et utilisateurs sont des indices ;
+    les listes d'objets correspondantes (satellites, requests, users) ne servent
+    qu'aux vues et peuvent être liées plus tard avec bind. La colonne index garde
+    la position de chaque opportunité dans le store d'origine (root), ce qui rend
+    les identifiants stables à travers les tris et filtrages.
+    """
+
+    def __init__(self, t_start, t_end, duration, reward, priority, satellite, request, user, index=None, root=None):
+        self.t_start = t_start
+        self.t_end = t_end
+        self.duration = duration
+        self.reward = reward
+        self.priority = priority
+        self.satellite = satellite
+        self.request = request
+        self.user = user
+        self.index = index if index is not None else np.arange(len(t_start), dtype=np.int32)
+        self.root = root if root is not None else self
+        self.satellites = self.root.satellites if root is not None else None
+        self.requests = self.root.requests if root is not None else None
+        self.users = self.root.users if root is not None else None
+
+    def bind(self, satellites, requests, users):
+        self.satellites = satellites
+        self.requests = requests
+        self.users = users
+
+    def __len__(self):
+        return len(self.t_start)
+
+    def __getitem__(self, i):
+        return OpportunityView(self, i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield OpportunityView(self, i)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in (self.t_start, self.t_end, self.duration, self.reward, self.priority,
+                                                 self.satellite, self.request, self.user, self.index))
+
+    def take(self, indices):
+        store = OpportunityStore(
+            self.t_start[indices], self.t_end[indices], self.duration[indices], self.reward[indices],
+            self.priority[indices], self.satellite[indices], self.request[indices], self.user[indices],
+            self.index[indices], self.root,
+        )
+        store.bind(self.satellites, self.requests, self.users)
+        return store
+
+    def filter(self, mask):
+        return self.take(np.flatnonzero(mask))
+
+    def sort_order(self):
+        # Même ordre que dcop.sort_observations : priorité de l'utilisateur puis date de début
+        return np.lexsort((self.t_start, self.priority))
+
+    def sorted(self):
+        return self.take(self.sort_order())
+
+    def by_user(self, u):
+        return self.filter(self.user == u)
+
+    def by_satellite(self, s):
+        return self.filter(self.satellite == s)
+
+    def group_by(self, column, n):
+        """
+        Découpe le store selon une colonne d'indices (user, satellite...) en un seul
+        tri stable : les opportunités de chaque groupe gardent leur ordre.
+
+        Returns:
+            list: n stores, celui de la valeur k en position k.
+        """
+        order = np.argsort(column, kind="stable")
+        bounds = np.searchsorted(column[order], np.arange(n + 1), side="left")
+        return [self.take(order[bounds[k]:bounds[k + 1]]) for k in range(n)]
+
+    def feasible(self):
+        """
+        Masque des opportunités dont la fenêtre peut contenir l'observation.
+        """
+        return self.t_end - self.t_start >= self.duration
+
+    def overlaps(self, satellite, start, end):
+        """
+        Masque des opportunités du satellite qui chevauchent l'intervalle ]start, end[.
+        """
+        return (self.satellite == satellite) & (self.t_start < end) & (self.t_end > start)
+
+
+class ColumnarInstance:
+    """
+    Instance EOSCSP sous forme de colonnes NumPy.
+
+    Les satellites, utilisateurs, fenêtres exclusives, tâches et opportunités
+    d'observation sont décrits par des tableaux parallèles ; les références entre
+    objets sont des indices. Les identifiants suivent ceux de generator.Instance :
+    satellite_{i+1}, exclusive_user_{i+1} (le planificateur central en dernier),
+    task_{i+1}, sauf si ids les donne explicitement.
+    """
+
+    def __init__(self, satellite_t_start, satellite_t_end, satellite_capacity, satellite_transition_time,
+                 user_priority, window_user, window_satellite, window_start, window_end,
+                 task_user, task_satellite, task_t_start, task_t_end, task_duration, task_reward, task_gps,
+                 opportunities, ids=None):
+        self.satellite_t_start = satellite_t_start
+        self.satellite_t_end = satellite_t_end
+        self.satellite_capacity = satellite_capacity
+        self.satellite_transition_time = satellite_transition_time
+
+        self.user_priority = user_priority
+        self.window_user = window_user
+        self.window_satellite = window_satellite
+        self.window_start = window_start
+        self.window_end = window_end
+
+        self.task_user = task_user
+        self.task_satellite = task_satellite
+        self.task_t_start = task_t_start
+        self.task_t_end = task_t_end
+        self.task_duration = task_duration
+        self.task_reward = task_reward
+        self.task_gps = task_gps
+
+        self.opportunities = opportunities
+        # Identifiants {"satellites": [...], "users": [...], "tasks": [...]} s'ils ne suivent pas la numérotation par défaut
+        self.ids = ids
+
+    @property
+    def num_satellites(self):
+        return len(self.satellite_t_start)
+
+    @property
+    def num_users(self):
+        return len(self.user_priority)
+
+    @property
+    def num_tasks(self):
+        return len(self.task_user)
+
+    @property
+    def num_opportunities(self):
+        return len(self.opportunities)
+
+    @staticmethod
+    def generate(num_satellites, num_exclusive_users, num_tasks_per_user, seed=None):
+        """
+        Génère une instance avec les mêmes lois que generator.Instance.generate,
+        tirées par lots depuis un numpy.random.Generator.
+
+        Args:
+            num_satellites (int): Nombre de satellites.
+            num_exclusive_users (int): Nombre d'utilisateurs exclusifs.
+            num_tasks_per_user (int): Nombre de requêtes par utilisateur exclusif.
+            seed (int): Graine du générateur ; la même graine redonne la même instance.
+
+        Returns:
+            ColumnarInstance: L'instance générée.
+        """
+        rng = np.random.default_rng(seed)
+
+        # Satellites
+        satellite_t_start = rng.uniform(0, 100, num_satellites)
+        satellite_t_end = satellite_t_start + rng.uniform(0, TOTAL_TIME - satellite_t_start)
+        satellite_capacity = np.full(num_satellites, 20)
+        satellite_transition_time = np.full(num_satellites, 1.0)
+
+        # Utilisateurs : priorités tirées sans remise, la dernière restante pour le planificateur central
+        num_users = num_exclusive_users + 1
+        user_priority = rng.permutation(num_users) + 1
+        windows = []
+        windows_by_satellite = {}
+        used_satellites = set()
+        for u in range(num_exclusive_users):
+            sample_size = rng.integers(1, num_satellites + 1)
+            for s in rng.choice(num_satellites, size=sample_size, replace=False):
+                if s not in used_satellites:
+                    existing_windows = windows_by_satellite.setdefault(s, [])
+                    satellite_windows = generator.generate_exclusive_windows(8, (15, 20), TOTAL_TIME, existing_windows, rng)
+                    if satellite_windows:
+                        windows.extend((u, s, start, end) for start, end in satellite_windows)
+                        existing_windows.extend(satellite_windows)
+                        used_satellites.add(s)
+        window_columns = np.array(windows, dtype=float).reshape(-1, 4)
+        window_user = window_columns[:, 0].astype(int)
+        window_satellite = window_columns[:, 1].astype(int)
+        window_start = window_columns[:, 2]
+        window_end = window_columns[:, 3]
+
+        # Tâches
+        num_user_requests = np.full(num_users, num_tasks_per_user)
+        num_user_requests[-1] = rng.integers(8, 81)
+        task_user = np.repeat(np.arange(num_users), num_user_requests)
+        num_tasks = len(task_user)
+        task_t_start = rng.uniform(0, TOTAL_TIME, num_tasks)
+        task_t_end = task_t_start + rng.uniform(10, 20, num_tasks)
+        task_duration = np.full(num_tasks, 5.0)
+        task_reward = np.where(user_priority[task_user] >= 10,
+                               rng.integers(10, 51, num_tasks),
+                               rng.integers(1, 6, num_tasks))
+        task_gps = np.column_stack((
+            rng.uniform(-90, 90, num_tasks),
+            rng.uniform(-180, 180, num_tasks),
+            rng.uniform(0, 400, num_tasks),
+        ))
+
+        # Satellite de chaque tâche : un de ceux de l'utilisateur s'il a des fenêtres exclusives
+        task_satellite = np.empty(num_tasks, dtype=int)
+        for u in range(num_users):
+            allowed = np.unique(window_satellite[window_user == u])
+            if len(allowed) == 0:
+                allowed = np.arange(num_satellites)
+            in_user = task_user == u
+            task_satellite[in_user] = allowed[rng.integers(0, len(allowed), in_user.sum())]
+
+        # Opportunités d'observation
+        opportunity_task = np.repeat(np.arange(num_tasks), OPPORTUNITIES_PER_TASK)
+        opportunity_t_start = rng.uniform(task_t_start[opportunity_task],
+                                          task_t_end[opportunity_task] - task_duration[opportunity_task])
+        opportunity_t_end = opportunity_t_start + task_duration[opportunity_task]
+
+        # Les opportunités héritent de la durée, de la récompense, du satellite et de l'utilisateur de leur tâche
+        opportunity_user = task_user[opportunity_task]
+        opportunities = OpportunityStore(
+            t_start=opportunity_t_start,
+            t_end=opportunity_t_end,
+            duration=task_duration[opportunity_task],
+            reward=task_reward[opportunity_task].astype(np.int32),
+            priority=user_priority[opportunity_user].astype(np.int32),
+            satellite=task_satellite[opportunity_task].astype(np.int32),
+            request=opportunity_task.astype(np.int32),
+            user=opportunity_user.astype(np.int32),
+        )
+
+        return ColumnarInstance(
+            satellite_t_start, satellite_t_end, satellite_capacity, satellite_transition_time,
+            user_priority, window_user, window_satellite, window_start, window_end,
+            task_user, task_satellite, task_t_start, task_t_end, task_duration, task_reward, task_gps,
+            opportunities,
+        )
+
+    @staticmethod
+    def from_instance(instance):
+        """
+        Convertit une generator.Instance (par exemple produite par Instance.generate)
+        en colonnes, pour l'enregistrer avec storage.save_instance.
+
+        Les opportunités gardent l'ordre de instance.observation_opportunities, qui
+        doit regrouper celles d'une même tâche, dans l'ordre de instance.tasks (comme
+        Instance.generate et filter_by_user). Le satellite d'une tâche est celui de
+        sa première opportunité (-1 si elle n'en a pas).
+
+        Raises:
+            ValueError: Si les opportunités ne sont pas regroupées par tâche.
+        """
+        satellites, users, tasks = instance.satellites, instance.users, instance.tasks
+        satellite_index = {satellite.id: s for s, satellite in enumerate(satellites)}
+        user_index = {user.id: u for u, user in enumerate(users)}
+        task_index = {task: k for k, task in enumerate(tasks)}
+
+        windows = [(u, satellite_index[satellite_id], start, end)
+                   for u, user in enumerate(users) for satellite_id, start, end in user.exclusive_windows]
+        window_columns = np.array(windows, dtype=float).reshape(-1, 4)
+
+        observations = instance.observation_opportunities
+        request = np.array([task_index[o.request_o] for o in observations], dtype=np.int32)
+        if np.any(request[1:] < request[:-1]):
+            raise ValueError("Les opportunités d'observation doivent être regroupées par tâche, dans l'ordre des tâches")
+        opportunities = OpportunityStore(
+            t_start=np.array([o.t_start_o for o in observations], dtype=float),
+            t_end=np.array([o.t_end_o for o in observations], dtype=float),
+            duration=np.array([o.duration_o for o in observations], dtype=float),
+            reward=np.array([o.reward_o for o in observations], dtype=np.int32),
+            priority=np.array([o.priority_o for o in observations], dtype=np.int32),
+            satellite=np.array([satellite_index[o.satellite_o.id] for o in observations], dtype=np.int32),
+            request=request,
+            user=np.array([user_index[o.user_o.id] for o in observations], dtype=np.int32),
+        )
+
+        columnar_instance = ColumnarInstance(
+            satellite_t_start=np.array([satellite.t_start_s for satellite in satellites], dtype=float),
+            satellite_t_end=np.array([satellite.t_end_s for satellite in satellites], dtype=float),
+            satellite_capacity=np.array([satellite.capacity for satellite in satellites], dtype=np.int64),
+            satellite_transition_time=np.array([satellite.transition_time for satellite in satellites], dtype=float),
+            user_priority=np.array([user.priority for user in users], dtype=np.int64),
+            window_user=window_columns[:, 0].astype(int),
+            window_satellite=window_columns[:, 1].astype(int),
+            window_start=window_columns[:, 2],
+            window_end=window_columns[:, 3],
+            task_user=np.array([user_index[task.user.id] for task in tasks], dtype=np.int64),
+            task_satellite=np.array([satellite_index[task.observation_opportunities[0].satellite_o.id]
+                                     if task.observation_opportunities else -1 for task in tasks], dtype=np.int64),
+            task_t_start=np.array([task.t_start_r for task in tasks], dtype=float),
+            task_t_end=np.array([task.t_end_r for task in tasks], dtype=float),
+            task_duration=np.array([task.duration for task in tasks], dtype=float),
+            task_reward=np.array([task.reward for task in tasks], dtype=np.int64),
+            task_gps=np.array([task.gps_position for task in tasks], dtype=float).reshape(-1, 3),
+            opportunities=opportunities,
+        )
+        ids = {
+            "satellites": [satellite.id for satellite in satellites],
+            "users": [user.id for user in users],
+            "tasks": [task.id for task in tasks],
+        }
+        defaults = {
+            "satellites": [columnar_instance.satellite_id(s) for s in range(len(satellites))],
+            "users": [columnar_instance.user_id(u) for u in range(len(users))],
+            "tasks": [columnar_instance.task_id(k) for k in range(len(tasks))],
+        }
+        if ids != defaults:
+            columnar_instance.ids = ids
+        return columnar_instance
+
+    def satellite_id(self, s):
+        return self.ids["satellites"][s] if self.ids else f"satellite_{s + 1}"
+
+    def user_id(self, u):
+        if self.ids:
+            return self.ids["users"][u]
+        return "central_planner" if u == self.num_users - 1 else f"exclusive_user_{u + 1}"
+
+    def task_id(self, k):
+        return self.ids["tasks"][k] if self.ids else f"task_{k + 1}"
+
+    def materialize(self, compact=False):
+        """
+        Construit l'instance objet équivalente (generator.Instance).
+
+        Args:
+            compact (bool): Si vrai, les opportunités restent dans le store colonnes et
+                l'instance ne manipule que des vues OpportunityView.
+        """
+        satellites = [
+            generator.Satellite(self.satellite_id(i), t_start, t_end, capacity, transition_time)
+            for i, (t_start, t_end, capacity, transition_time) in enumerate(zip(
+                self.satellite_t_start.tolist(), self.satellite_t_end.tolist(),
+                self.satellite_capacity.tolist(), self.satellite_transition_time.tolist()))
+        ]
+
+        exclusive_windows = [[] for _ in range(self.num_users)]
+        for u, s, start, end in zip(self.window_user.tolist(), self.window_satellite.tolist(),
+                                    self.window_start.tolist(), self.window_end.tolist()):
+            exclusive_windows[u].append((satellites[s].id, start, end))
+        users = [generator.User(self.user_id(u), priority, exclusive_windows[u])
+                 for u, priority in enumerate(self.user_priority.tolist())]
+
+        tasks = []
+        for k, (u, s, t_start, t_end, duration, reward, gps) in enumerate(zip(
+                self.task_user.tolist(), self.task_satellite.tolist(), self.task_t_start.tolist(),
+                self.task_t_end.tolist(), self.task_duration.tolist(), self.task_reward.tolist(),
+                self.task_gps.tolist())):
+            tasks.append(generator.Task(self.task_id(k), t_start, t_end, duration, reward, tuple(gps), users[u], []))
+
+        store = self.opportunities
+        if compact:
+            # Les opportunités d'une tâche doivent être contiguës, dans l'ordre des tâches
+            if np.any(store.request[1:] < store.request[:-1]):
+                raise ValueError("Les opportunités ne sont pas regroupées par tâche : utiliser compact=False")
+            # Racine propre à cette matérialisation, sur les mêmes colonnes : les vues
+            # d'instances différentes ne partagent pas leurs objets et sont distinctes
+            store = OpportunityStore(store.t_start, store.t_end, store.duration, store.reward, store.priority,
+                                     store.satellite, store.request, store.user, index=store.index)
+            store.bind(satellites, tasks, users)
+            bounds = np.searchsorted(store.request, np.arange(len(tasks) + 1)).tolist()
+            for k, task in enumerate(tasks):
+                task.observation_opportunities = OpportunitySlice(store, bounds[k], bounds[k + 1])
+            return generator.Instance(satellites, users, tasks, store)
+
+        observation_opportunities = []
+        # Mêmes valeurs que les vues du mode compact : celles des colonnes du store
+        for k, s, u, t_start, t_end, duration, reward, priority in zip(
+                store.request.tolist(), store.satellite.tolist(), store.user.tolist(), store.t_start.tolist(),
+                store.t_end.tolist(), store.duration.tolist(), store.reward.tolist(), store.priority.tolist()):
+            task = tasks[k]
+            o = generator.ObservationOpportunity(
+                t_start_o=t_start,
+                t_end_o=t_end,
+                duration_o=duration,
+                request_o=task,
+                reward_o=reward,
+                satellite_o=satellites[s],
+                user_o=users[u],
+                priority_o=priority
+            )
+            task.observation_opportunities.append(o)
+            observation_opportunities.append(o)
+
+        return generator.Instance(satellites, users, tasks, observation_opportunities)
@@ -0,0 +1,196 @@
+import numpy as np
+
+
+def _composite_keys(satellites, *times):
+    # Clé satellite * span + date : un seul tableau trié pour tous les satellites
+    base = min(t.min() for t in times if len(t))
+    span = max(t.max() for t in times if len(t)) - base + 1
+    return [satellite * span + (t - base) for satellite, t in zip(satellites, times)]
+
+
+def _expand(lo, hi):
+    """
+    Développe les intervalles [lo, hi[ : (numéro de l'intervalle, position) pour chaque position.
+    """
+    count = np.maximum(hi - lo, 0)
+    group = np.repeat(np.arange(len(lo)), count)
+    position = np.repeat(lo, count) + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    return group, position
+
+
+def _csr(source, target, n):
+    order = np.argsort(source, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(source, minlength=n), out=indptr[1:])
+    return indptr, target[order]
+
+
+def sweep_conflicts(satellite, t_start, t_end, transition_time):
+    """
+    Graphe des conflits temporels entre opportunités, au format CSR.
+
+    Deux opportunités d'un même satellite sont en conflit lorsque leurs fenêtres,
+    prolongées du temps de transition du satellite, se chevauchent : elles ne
+    peuvent pas être planifiées toutes les deux (si la fenêtre fixe la date de début,
+    comme dans les générateurs ; sinon le conflit n'est que possible). Après un tri
+    par satellite et date de début, les voisins suivants de chaque opportunité sont
+    un intervalle contigu trouvé par dichotomie : O(n log n + conflits).
+
+    Args:
+        satellite (np.ndarray): Indice du satellite de chaque opportunité.
+        t_start, t_end (np.ndarray): Fenêtre de chaque opportunité.
+        transition_time (np.ndarray): Temps de transition de chaque satellite.
+
+    Returns:
+        tuple: (indptr, indices) : les voisins de i sont indices[indptr[i]:indptr[i + 1]].
+    """
+    n = len(t_start)
+    if n == 0:
+        return np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int64)
+    order = np.lexsort((t_start, satellite))
+    sorted_satellite = satellite[order]
+    padded_end = t_end[order] + transition_time[sorted_satellite]
+    key_start, key_end = _composite_keys((sorted_satellite, sorted_satellite), t_start[order], padded_end)
+    hi = np.searchsorted(key_start, key_end, side="left")
+    group, position = _expand(np.arange(1, n + 1), hi)
+    source, target = order[group], order[position]
+    return _csr(np.concatenate((source, target)), np.concatenate((target, source)), n)
+
+
+def sweep_ownership(satellite, t_start, t_end, window_satellite, window_start, window_end):
+    """
+    Fenêtres exclusives qui chevauchent chaque opportunité, au format CSR.
+
+    Mêmes fenêtres, dans le même ordre, que ExclusiveWindowIndex.owners : celles du
+    satellite de l'opportunité qui chevauchent ]t_start, t_end[.
+
+    Returns:
+        tuple: (indptr, indices) : les fenêtres de i sont indices[indptr[i]:indptr[i + 1]].
+    """
+    n = len(t_start)
+    if n == 0 or len(window_start) == 0:
+        return np.zeros(n + 1, dtype=np.int64), np.empty(0, dtype=np.int64)
+    order = np.lexsort((window_start, window_satellite))
+    # Les fenêtres d'un satellite sont disjointes : leurs fins sont triées comme leurs débuts
+    key_window_start, key_window_end, key_start, key_end = _composite_keys(
+        (window_satellite[order], window_satellite[order], satellite, satellite),
+        window_start[order], window_end[order], t_start, t_end)
+    lo = np.searchsorted(key_window_end, key_start, side="right")
+    hi = np.searchsorted(key_window_start, key_end, side="left")
+    group, position = _expand(lo, hi)
+    return _csr(group, order[position], n)
+
+
+def satellite_components(items, satellites_of):
+    """
+    Regroupe les éléments qui partagent un satellite (union-find sur les satellites).
+
+    Args:
+        items (list): Éléments à regrouper (requêtes...).
+        satellites_of (callable): Identifiants des satellites touchés par un élément.
+
+    Returns:
+        list: Les composantes, chacune étant la liste croissante des indices de ses
+            éléments ; un élément qui ne touche aucun satellite n'appartient à aucune.
+    """
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    touched = []
+    for item in items:
+        satellites = list(set(satellites_of(item)))
+        for satellite_id in satellites:
+            parent.setdefault(satellite_id, satellite_id)
+        for satellite_id in satellites[1:]:
+            parent[find(satellite_id)] = find(satellites[0])
+        touched.append(satellites)
+
+    components = {}
+    for i, satellites in enumerate(touched):
+        if satellites:
+            components.setdefault(find(satellites[0]), []).append(i)
+    return list(components.values())
+
+
+class ConflictGraph:
+    """
+    Conflits temporels entre les opportunités d'une instance et fenêtres exclusives
+    qui les chevauchent, précalculés par balayage (voir sweep_conflicts et
+    sweep_ownership). Les requêtes se font ensuite en O(degré).
+
+    Offre owners_of, comme ExclusiveWindowIndex, et peut donc le remplacer dans
+    build_DCOP et decompose_requests pour les opportunités de l'instance.
+
+    Args:
+        observations (list | OpportunityStore): Opportunités de l'instance (store racine
+            pour un store colonnes : ses lignes sont les indices des vues).
+        satellites (list): Satellites de l'instance.
+        users (list): Utilisateurs de l'instance.
+    """
+
+    def __init__(self, observations, satellites, users):
+        self.observations = observations
+        satellite_index = {satellite.id: i for i, satellite in enumerate(satellites)}
+        if hasattr(observations, "satellite"):
+            # Store colonnes (columnar.OpportunityStore) : les lignes sont déjà des indices
+            if observations.root is not observations:
+                raise ValueError("Le graphe des conflits d'un store colonnes se construit sur le store racine")
+            satellite = np.asarray(observations.satellite, dtype=np.int64)
+            t_start, t_end = observations.t_start, observations.t_end
+            self._rows = None
+        else:
+            satellite = np.array([satellite_index[o.satellite_o.id] for o in observations], dtype=np.int64)
+            t_start = np.array([o.t_start_o for o in observations], dtype=float)
+            t_end = np.array([o.t_end_o for o in observations], dtype=float)
+            self._rows = {o: i for i, o in enumerate(observations)}
+        transition_time = np.array([s.transition_time for s in satellites], dtype=float)
+        self.indptr, self.indices = sweep_conflicts(satellite, t_start, t_end, transition_time)
+
+        windows = [(satellite_index[satellite_id], start, end, user.id)
+                   for user in users for satellite_id, start, end in user.exclusive_windows]
+        self.window_user = [user_id for _, _, _, user_id in windows]
+        self.window_indptr, self.window_indices = sweep_ownership(
+            satellite, t_start, t_end,
+            np.array([w[0] for w in windows], dtype=np.int64),
+            np.array([w[1] for w in windows], dtype=float),
+            np.array([w[2] for w in windows], dtype=float),
+        )
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_conflicts(self):
+        return len(self.indices) // 2
+
+    def row(self, o):
+        return o.index if self._rows is None else self._rows[o]
+
+    def neighbours(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def degree(self, o):
+        i = self.row(o)
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def conflicts(self, o):
+        """
+        Opportunités en conflit avec o (même satellite, fenêtres trop proches).
+        """
+        return [self.observations[j] for j in self.neighbours(self.row(o)).tolist()]
+
+    def owners_of(self, o):
+        """
+        Propriétaires des fenêtres exclusives qui chevauchent o, dans l'ordre des fenêtres.
+        """
+        i = self.row(o)
+        owners = []
+        for w in self.window_indices[self.window_indptr[i]:self.window_indptr[i + 1]].tolist():
+            if self.window_user[w] not in owners:
+                owners.append(self.window_user[w])
+        return owners
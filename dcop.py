@@ -1,8 +1,21 @@
-import subprocess
-import json
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
 import generator
+import dcop_engine
+import tracing
+from conflicts import satellite_components
+from local_search import improve_schedule
+from dcop_model import BINARY, Constraint, DCOPModel, Variable, load_yaml
+from pydcop_runner import PydcopRunner
+from schedule import Schedule
+
+logger = logging.getLogger(__name__)
 
 def sort_observations(observations):
+    # Un store colonnes (columnar.OpportunityStore) se trie de façon vectorisée
+    if hasattr(observations, "sort_order"):
+        return [observations[i] for i in observations.sort_order().tolist()]
     return sorted(observations, key=lambda o: (o.user_o.priority, o.t_start_o))
 
 
@@ -10,43 +23,34 @@ def greedy_eoscsp_solver(instance, R):
     # Initialiser l'allocation vide
     M = {}
     # Trier les opportunités d'observation
-    O_sorted = sort_observations(instance.observation_opportunities)    
+    O_sorted = sort_observations(instance.observation_opportunities)
 
     for o in O_sorted:
+        # Une seule observation par requête : ignorer les requêtes déjà servies
+        if R.is_served(o.request_o):
+            continue
         t = first_slot(o, instance, R)
         if t != None:
             M[o] = t
-            # Mettre à jour les opportunités d'observation restantes
-            O_sorted = [op for op in O_sorted if op.request_o != o.request_o]
 
     return M
 
-def first_slot(o, instance, R):
+def first_slot(o, instance, R, agent_id=None):
+    tracer = tracing.active()
     satellite = o.satellite_o
-    if len(R[satellite.id]) < satellite.capacity:
-        if not R[satellite.id]:
-            if o.t_end_o >= o.t_start_o + o.duration_o:
-                R[satellite.id].append((o, (satellite.id, o.t_start_o)))
-                return (satellite.id, o.t_start_o)
-        else:
-            i = 0
-            while i <= len(R[satellite.id]):
-                t_start_prime = o.t_start_o
-                if i > 0:
-                    observation_prev, (_, t_prev) = R[satellite.id][i - 1]
-                    t_start_prime = max(o.t_start_o, t_prev + observation_prev.duration_o + satellite.transition_time)
-                if t_start_prime + o.duration_o <= o.t_end_o:
-                    if i == len(R[satellite.id]):
-                        t_upper = o.t_end_o
-                        t_end_prime = t_start_prime + o.duration_o
-                    else:
-                        obs, (_, t_i) = R[satellite.id][i]
-                        t_upper = t_i
-                        t_end_prime = t_start_prime + o.duration_o + satellite.transition_time
-                    if t_start_prime < t_end_prime <= t_upper:
-                        R[satellite.id].insert(i, (o, (satellite.id, t_start_prime)))
-                        return (satellite.id, t_start_prime)
-                i+=1
+    timeline = R[satellite.id]
+    if len(timeline) < satellite.capacity:
+        t = timeline.earliest_start(o)
+        if t is not None:
+            # Par défaut, l'affectation est décidée par le propriétaire de la requête
+            R.assign(o, (satellite.id, t), agent_id if agent_id else o.user_o.id)
+            if tracer.enabled:
+                tracer.count("first_slot.placed")
+            return (satellite.id, t)
+        if tracer.enabled:
+            tracer.count("first_slot.no_gap")
+    elif tracer.enabled:
+        tracer.count("first_slot.no_capacity")
 
     return None
 
@@ -63,183 +67,257 @@ def sort_requests(requests):
     return sorted(requests, key=lambda r: (r.user.priority, r.t_start_r))
 
 
-def s_dcop_eoscsp_solver(instance):
-    R = {satellite.id: [] for satellite in instance.satellites}
+def s_dcop_eoscsp_solver(instance, algorithm='dpop', backend='native', max_workers=1, cache=None,
+                         improve_time=None, improve_iterations=None, seed=None):
+    return s_dcop_schedule(instance, algorithm, backend, max_workers, cache, improve_time, improve_iterations,
+                           seed).solution()
+
+def s_dcop_schedule(instance, algorithm='dpop', backend='native', max_workers=1, cache=None,
+                    improve_time=None, improve_iterations=None, seed=None):
+    """
+    Exécute le solveur s-DCOP et retourne le plan complet (Schedule), y compris les
+    affectations propres des utilisateurs exclusifs ; s_dcop_eoscsp_solver n'en
+    retourne que la solution du planificateur central.
+
+    Si improve_time (secondes) ou improve_iterations est donné, le plan est ensuite
+    amélioré par recherche locale (local_search.improve_schedule) dans ce budget ;
+    seed fixe la graine de ses mouvements.
+
+    Avec max_workers > 1, chaque composante indépendante reçoit une copie du cache ;
+    les solutions et les compteurs des processus de travail sont ensuite fusionnés
+    dans cache.
+    """
+    tracer = tracing.active()
+    R = Schedule(instance.satellites)
+    # Cache des DCOP déjà résolus, partagé par toutes les requêtes de la résolution
+    if cache is None:
+        cache = dcop_engine.SolutionCache()
     # Étape 1 : Résoudre pour le planificateur central (u0)
-    central_planner_assignments = greedy_eoscsp_solver(instance.filter_by_user("central_planner"), R)
+    with tracer.phase("greedy", user="central_planner"):
+        greedy_eoscsp_solver(instance.filter_by_user("central_planner"), R)
 
     # Étape 2 : Résoudre pour chaque utilisateur exclusif
-    exclusive_assignments = {}
     for user in instance.users:
         if user.exclusive_windows:  # Utilisateurs avec fenêtres exclusives
-            exclusive_assignments[user.id] = greedy_eoscsp_solver(instance.filter_by_user(user.id), R)
+            with tracer.phase("greedy", user=user.id):
+                greedy_eoscsp_solver(instance.filter_by_user(user.id), R)
 
     # Étape 3 : Identifier les requêtes non assignées
-    assigned_requests = set([o.request_o for o in central_planner_assignments])
-    unassigned_requests = [r for r in instance.tasks if r not in assigned_requests]
-    Rsorted = sort_requests(unassigned_requests)
+    with tracer.phase("unassigned_requests"):
+        unassigned_requests = [r for r in instance.tasks if not R.is_served(r)]
+        Rsorted = sort_requests(unassigned_requests)
+        exclusive_windows = instance.exclusive_window_index
+    logger.debug("%d requêtes servies par les phases gloutonnes, %d requêtes pour la phase DCOP", len(R), len(Rsorted))
 
     # Étape 4-6 : Construire et résoudre le DCOP pour chaque requête triée
-    for r in Rsorted:
-        dcop_problem = build_DCOP_yaml(r.observation_opportunities, central_planner_assignments, exclusive_assignments, instance)
-        dcop_solutions = solve_DCOP(dcop_problem)
+    with tracer.phase("dcop", requests=len(Rsorted), max_workers=max_workers):
+        if max_workers > 1:
+            solve_DCOP_components(Rsorted, R, exclusive_windows, algorithm, backend, max_workers, cache)
+        elif backend != 'native':
+            # pydcop : les processus des composantes indépendantes se recouvrent
+            solve_requests_DCOP_batched(Rsorted, instance, R, exclusive_windows, algorithm, backend, cache)
+        else:
+            for r in Rsorted:
+                solve_request_DCOP(r, instance, R, exclusive_windows, algorithm, backend, cache)
 
-        # Intégrer directement les solutions DCOP dans les affectations
-        for user_id, assignments in dcop_solutions.items():
-            exclusive_assignments[user_id] = assignments
+    # Étape optionnelle : amélioration anytime du plan
+    if improve_time is not None or improve_iterations is not None:
+        improve_schedule(instance, R, improve_time, improve_iterations, seed)
 
     # Étape 7-9 : Rassembler les solutions pour le planificateur central et retourner la solution complète
-    non_exclusive_assignments = {o: time for user_id, user_assignments in exclusive_assignments.items() for o, time in user_assignments.items() if o.user_o.id != user_id}
-    total_assignments = {**central_planner_assignments, **non_exclusive_assignments}
-    return total_assignments
-
-""" def build_DCOP(observations, central_planner_assignments, exclusive_assignments, instance):
-    agents = {user.id for user in instance.users if user.exclusive_windows and any(
-        observation.satellite_o in [window[0] for window in user.exclusive_windows] 
-        and any(
-            observation.t_start_o < end and observation.t_end_o > start 
-            for _, start, end in user.exclusive_windows
-        )
-        for observation in observations
-    )}
-
-    # Création des variables et domaines pour chaque agent
-    variables = {}
-    domains = {}
-    for observation in observations:
-        for user_id in agents:
-            var_name = f"x_{user_id}_{observation.id}"
-            variables[var_name] = Variable(var_name, Domain(['0', '1']))
-            domains[var_name] = Domain(['0', '1'])
-
-    # Contraintes
-    constraints = []
-
-    # Contrainte 1 : Une observation par requête
-    for observation in observations:
-        involved_vars = [f"x_{user_id}_{observation.id}" for user_id in agents]
-        constraint_str = f"sum([{','.join(involved_vars)}]) <= 1"
-        constraints.append(constraint_from_str(f"one_observation_per_request_{observation.id}", involved_vars, constraint_str, domains))
-
-    # Contrainte 2 : Les satellites ne sont pas surchargés
-    for satellite in instance.satellites:
-        involved_vars = [
-            f"x_{user_id}_{observation.id}"
-            for user_id in agents
-            for observation in observations
-            if observation.satellite_o == satellite.id
-        ]
-        current_capacity = satellite.capacity - sum(
-            1 for o, _ in central_planner_assignments.items() if o.satellite_o == satellite.id
-        ) - sum(
-            1 for o, _ in exclusive_assignments.get(user_id, {}).items() if o.satellite_o == satellite.id for user_id in agents
-        )
-        constraint_str = f"sum([{','.join(involved_vars)}]) <= {current_capacity}"
-        constraints.append(constraint_from_str(f"satellite_capacity_{satellite.id}", involved_vars, constraint_str, domains))
-
-    # Contrainte 3 : Un agent par observation
-    for observation in observations:
-        involved_vars = [f"x_{user_id}_{observation.id}" for user_id in agents]
-        constraint_str = f"sum([{','.join(involved_vars)}]) <= 1"
-        constraints.append(constraint_from_str(f"one_agent_per_observation_{observation.id}", involved_vars, constraint_str, domains))
-
-    # Construction du problème DCOP
-    dcop_yaml = {
-        'name': 'EOSCSP',
-        'description': 'DCOP for EOSCSP problem',
-        'variables': {v.name: {'domain': v.domain.name} for v in variables.values()},
-        'domains': {d.name: list(d.values) for d in domains.values()},
-        'agents': list(agents),
-        'constraints': [str(c) for c in constraints]
-    }
-
-    dcop = load_dcop_from_dict(dcop_yaml)
-    return dcop """
-
-def build_DCOP_yaml(observations, central_planner_assignments, exclusive_assignments, instance):
-    yaml_content = "name: EOSCSP\n"
-    yaml_content += "objective: min\n\n"
-
-    # Définir les domaines
-    yaml_content += "domains:\n  binary:\n    values: [0, 1]\n\n"
+    if tracer.enabled:
+        solution = R.solution()
+        tracer.emit("cache", hits=cache.hits, misses=cache.misses, size=len(cache))
+        tracer.emit("solution", assigned=len(R), observations=len(solution),
+                    reward=sum(o.reward_o for o in solution))
+        tracer.flush_counters()
+    return R
+
+def solve_request_DCOP(r, instance, R, exclusive_windows, algorithm='dpop', backend='native', cache=None):
+    """
+    Construit et résout le DCOP d'une requête, puis place les observations acceptées dans le plan.
+
+    Returns:
+        list: Les placements effectués, sous la forme (observation, (satellite_id, t), user_id).
+    """
+    dcop_problem = build_request_DCOP(r, R, exclusive_windows)
+    if not dcop_problem.variables:
+        return []
+    dcop_solutions = solve_DCOP(dcop_problem, algorithm, backend, cache)
+    return place_DCOP_solution(r, instance, R, dcop_problem, dcop_solutions)
+
+def build_request_DCOP(r, R, exclusive_windows):
+    tracer = tracing.active()
+    with tracer.phase("build_DCOP", request=r.id):
+        dcop_problem = build_DCOP(r.observation_opportunities, R, exclusive_windows)
+    if tracer.enabled:
+        tracer.emit("dcop_model", request=r.id, variables=len(dcop_problem.variables),
+                    constraints=len(dcop_problem.constraints), agents=len(dcop_problem.agents))
+    return dcop_problem
+
+def place_DCOP_solution(r, instance, R, dcop_problem, dcop_solutions):
+    # Intégrer les solutions DCOP : placer les observations acceptées dans le plan des satellites
+    placed = []
+    observations = {o.id: o for o in r.observation_opportunities}
+    for user_id, accepted in dcop_solutions.items():
+        for observation_id in accepted:
+            o = observations[observation_id]
+            slot = first_slot(o, instance, R, user_id)
+            if slot != None:
+                placed.append((o, slot, user_id))
+    logger.debug("Requête %s : %d variables, %d contraintes, %d observation(s) placée(s)",
+                 r.id, len(dcop_problem.variables), len(dcop_problem.constraints), len(placed))
+    return placed
+
+def solve_requests_DCOP_batched(requests, instance, R, exclusive_windows, algorithm='dpop', runner=None, cache=None):
+    """
+    Résout les DCOP des requêtes avec pydcop en recouvrant les processus des
+    composantes indépendantes (voir decompose_requests).
+
+    À chaque tour, la requête suivante de chaque composante est construite sur le
+    plan courant, puis les DCOP du tour sont résolus ensemble (solve_DCOP_batch).
+    Des composantes différentes ne partageant ni plan ni capacité, les placements
+    sont identiques à ceux de la boucle séquentielle.
+    """
+    queues = [[requests[i] for i in component] for component in decompose_requests(requests, exclusive_windows)]
+    for wave in itertools.zip_longest(*queues):
+        batch = [(r, build_request_DCOP(r, R, exclusive_windows)) for r in wave if r is not None]
+        batch = [(r, dcop_problem) for r, dcop_problem in batch if dcop_problem.variables]
+        dcop_solutions = solve_DCOP_batch([dcop_problem for _, dcop_problem in batch], algorithm, runner, cache)
+        for (r, dcop_problem), solutions in zip(batch, dcop_solutions):
+            place_DCOP_solution(r, instance, R, dcop_problem, solutions)
+
+def decompose_requests(requests, exclusive_windows):
+    """
+    Regroupe les requêtes en composantes indépendantes.
+
+    Deux requêtes sont liées lorsqu'elles ont des observations candidates (dans une
+    fenêtre exclusive) sur un même satellite : les fenêtres exclusives étant propres
+    à un satellite, des requêtes de composantes différentes ne partagent ni plan,
+    ni capacité, ni fenêtre.
+
+    Args:
+        requests (list): Requêtes triées par priorité.
+        exclusive_windows (generator.ExclusiveWindowIndex | conflicts.ConflictGraph): Propriétaires des
+            fenêtres exclusives qui chevauchent chaque observation (owners_of).
+
+    Returns:
+        list: Les composantes, chacune étant la liste croissante des indices de ses requêtes.
+    """
+    # Une requête sans observation candidate n'a pas de DCOP à résoudre
+    return satellite_components(requests, lambda r: [o.satellite_o.id for o in r.observation_opportunities
+                                                     if exclusive_windows.owners_of(o)])
+
+def _solve_component(requests, placements, exclusive_windows, algorithm, backend, cache):
+    # Exécuté dans un processus de travail : reconstruire le plan des satellites concernés
+    satellites = {o.satellite_o.id: o.satellite_o for r in requests for o in r.observation_opportunities}
+    R = Schedule(satellites.values())
+    for o, slot, agent_id in placements:
+        R.assign(o, slot, agent_id)
+
+    results = []
+    for index, r in enumerate(requests):
+        for o, slot, user_id in solve_request_DCOP(r, None, R, exclusive_windows, algorithm, backend, cache):
+            results.append((index, o.id, slot, user_id))
+    # Le cache revient au processus principal pour y être fusionné
+    return results, cache
+
+def solve_DCOP_components(requests, R, exclusive_windows, algorithm='dpop', backend='native', max_workers=None,
+                          cache=None):
+    """
+    Résout les DCOP des requêtes en parallèle, une composante indépendante par tâche.
+
+    Chaque composante est traitée dans l'ordre de priorité, comme en séquentiel, et
+    les placements sont réintégrés dans R dans l'ordre de priorité global : le
+    résultat est identique à celui de la boucle séquentielle.
+
+    Si cache est donné, chaque composante en reçoit une copie, puis les nouvelles
+    solutions et les compteurs de chaque processus de travail y sont fusionnés.
+    """
+    tracer = tracing.active()
+    components = decompose_requests(requests, exclusive_windows)
+    placed = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=tracing.reset_worker) as executor:
+        futures = []
+        for component in components:
+            component_requests = [requests[i] for i in component]
+            satellite_ids = {o.satellite_o.id for r in component_requests for o in r.observation_opportunities}
+            placements = [(o, slot, R.agent_of(o)) for satellite_id in satellite_ids for o, slot in R[satellite_id]]
+            component_cache = cache.copy() if cache is not None else dcop_engine.SolutionCache()
+            futures.append(executor.submit(_solve_component, component_requests, placements, exclusive_windows,
+                                           algorithm, backend, component_cache))
+        for component, future in zip(components, futures):
+            results, component_cache = future.result()
+            for index, observation_id, slot, user_id in results:
+                placed.append((component[index], observation_id, slot, user_id))
+            if cache is not None:
+                cache.merge(component_cache)
+            if tracer.enabled:
+                tracer.emit("dcop_component", requests=len(component), placed=len(results),
+                            cache_hits=component_cache.hits, cache_misses=component_cache.misses)
+
+    placed.sort(key=lambda p: p[0])
+    for request_index, observation_id, slot, user_id in placed:
+        o = next(o for o in requests[request_index].observation_opportunities if o.id == observation_id)
+        R.assign(o, slot, user_id)
+
+def build_DCOP(observations, R, exclusive_windows):
+    """
+    Construit en mémoire le DCOP d'une requête non assignée.
+
+    Seuls les satellites et les fenêtres exclusives touchés par les observations
+    de la requête sont parcourus : la construction ne dépend pas de la taille de
+    l'instance complète.
+
+    Args:
+        observations (list): Opportunités d'observation de la requête.
+        R (Schedule): Plan global courant.
+        exclusive_windows (generator.ExclusiveWindowIndex | conflicts.ConflictGraph): Propriétaires des
+            fenêtres exclusives qui chevauchent chaque observation (owners_of).
+
+    Returns:
+        DCOPModel: Le problème DCOP de la requête.
+    """
+    model = DCOPModel()
+    request_vars = []
+    vars_by_satellite = {}
 
     # Identifier les agents et créer les variables
-    yaml_content += "variables:\n"
-    agents = set()
-    for user in instance.users:
-        if user.exclusive_windows:
-            print(user.id)
-            for obs in observations:
-                for window in user.exclusive_windows:
-                    print(obs.satellite_o.id, window[0])
-                    print(obs.t_start_o, obs.t_end_o)
-                    print(window[1], window[2])
-
-                if any(obs.satellite_o.id == window[0] and (window[1] < obs.t_end_o and window[2] > obs.t_start_o) 
-                       for window in user.exclusive_windows):
-                    agents.add(user.id)
-                    var_name = f"x_{user.id}_{obs.id}"
-                    yaml_content += f"  {var_name}:\n    domain: binary\n\n"
-    print(agents)
-
-    # Définir les contraintes
-    yaml_content += "constraints:\n"
-    
-    # Contrainte 1: Une observation par requête pour tous les agents
     for obs in observations:
-        constraint_name = f"one_observation_{obs.id}"
-        yaml_content += f"  {constraint_name}:\n"
-        yaml_content += "    type: intention\n"
-        involved_vars = [f"x_{agent_id}_{obs.id}" for agent_id in agents]
-        yaml_content += f"    function: 'sum([{','.join(involved_vars)}]) <= 1'\n\n"
-
-    # Contrainte 2: Capacité des satellites
-    for satellite in instance.satellites:
-        constraint_name = f"satellite_capacity_{satellite.id}"
-        yaml_content += f"  {constraint_name}:\n"
-        yaml_content += "    type: intention\n"
-        
-        involved_vars = []
-        for agent_id in agents:
-            for obs in observations:
-                if obs.satellite_o.id == satellite.id:
-                    var_name = f"x_{agent_id}_{obs.id}"
-                    involved_vars.append(var_name)
-
-        # Calcul de la capacité actuelle du satellite
-        assigned_observations = set()
-        for obs, _ in central_planner_assignments.items():
-            if obs.satellite_o.id == satellite.id:
-                assigned_observations.add(obs.id)
-        for user_assignments in exclusive_assignments.values():
-            for obs, _ in user_assignments.items():
-                if obs.satellite_o.id == satellite.id:
-                    assigned_observations.add(obs.id)
-        
-        print(len(assigned_observations))
-
-        current_capacity = satellite.capacity - len(assigned_observations)
-        yaml_content += f"    function: 'sum([{','.join(involved_vars)}]) <= {current_capacity}'\n\n"
-
-
-    # Contrainte 3: Un agent par observation
-    for obs in observations:
-        constraint_name = f"one_agent_per_observation_{obs.id}"
-        yaml_content += f"  {constraint_name}:\n"
-        yaml_content += "    type: intention\n"
-        involved_vars = [f"x_{agent_id}_{obs.id}" for agent_id in agents]
-        yaml_content += f"    function: 'sum([{','.join(involved_vars)}]) <= 1'\n\n"
+        satellite = obs.satellite_o
+        timeline = R[satellite.id]
+        # L'observation doit encore tenir dans le plan du satellite
+        if R.remaining_capacity(satellite) <= 0 or timeline.earliest_start(obs) is None:
+            continue
+        obs_vars = []
+        for agent_id in exclusive_windows.owners_of(obs):
+            var_name = f"x_{agent_id}_{obs.id}"
+            model.add_variable(Variable(var_name, BINARY, agent_id, obs, obs.reward_o))
+            obs_vars.append(var_name)
+        if not obs_vars:
+            continue
+        request_vars.extend(obs_vars)
+        vars_by_satellite.setdefault(satellite, []).extend(obs_vars)
+
+        # Contrainte 3: Un agent par observation
+        if len(obs_vars) > 1:
+            model.add_constraint(Constraint(f"one_agent_per_observation_{obs.id}", obs_vars, 1))
+
+    if not request_vars:
+        return model
+
+    # Contrainte 1: Une observation par requête pour tous les agents
+    model.add_constraint(Constraint(f"one_observation_{observations[0].request_o.id}", request_vars, 1))
 
-    # Liste des agents
-    yaml_content += "agents:\n"
-    for agent_id in agents:
-        yaml_content += f"  - {agent_id}\n"
+    # Contrainte 2: Capacité restante des satellites
+    for satellite, involved_vars in vars_by_satellite.items():
+        current_capacity = R.remaining_capacity(satellite)
+        model.add_constraint(Constraint(f"satellite_capacity_{satellite.id}", involved_vars, current_capacity))
 
-    # Écrire le contenu dans un fichier
-    with open("dcop_eoscsp.yaml", "w") as file:
-        file.write(yaml_content)
+    return model
 
-    return "dcop_eoscsp.yaml"
+def build_DCOP_yaml(observations, R, exclusive_windows, path="dcop_eoscsp.yaml"):
+    return build_DCOP(observations, R, exclusive_windows).to_yaml(path)
 
 
 """ def solve_DCOP(dcop_problem, algorithm='dpop'):
@@ -264,45 +342,128 @@ def build_DCOP_yaml(observations, central_planner_assignments, exclusive_assignm
 
     return formatted_result """
 
-def solve_DCOP(dcop_yaml_file, algorithm='dpop'):
-    output_file = "results.json"
-    command = f"pydcop --output {output_file} solve --algo {algorithm} {dcop_yaml_file}"
-    
-    try:
-        subprocess.run(command, check=True, shell=True)
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Une erreur s'est produite lors de l'exécution de pydcop: {e}")
-
-    try:
-        with open(output_file, 'r') as f:
-            results = json.load(f)
-            assignments = results.get("assignment", {})
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Le fichier de résultats '{output_file}' n'a pas été trouvé.")
+def parse_variable_name(var_name):
+    # x_<user_id>_<observation_id>, les deux identifiants contenant eux-mêmes des '_'
+    user_id, observation_number = var_name[len("x_"):].rsplit("_obs_", 1)
+    return user_id, f"obs_{observation_number}"
 
+def format_DCOP_result(assignments):
     # Formatter les résultats pour correspondre au format attendu
     formatted_result = {}
     for var_name, value in assignments.items():
-        user_id, observation_id = var_name.split('_')[1:]
-        if value == "1":
+        user_id, observation_id = parse_variable_name(var_name)
+        if int(value) == 1:
             if user_id not in formatted_result:
                 formatted_result[user_id] = {}
             formatted_result[user_id][observation_id] = True  # Ou une autre valeur appropriée
 
     return formatted_result
 
+def solve_DCOP(dcop_problem, algorithm='dpop', backend='native', cache=None):
+    """
+    Résout un DCOP produit par build_DCOP ou build_DCOP_yaml.
 
+    Args:
+        dcop_problem (DCOPModel | str): Le DCOP en mémoire, ou le chemin d'un fichier YAML.
+        algorithm (str): Algorithme de résolution ('dpop' ou 'dsa').
+        backend (str | PydcopRunner): 'native' pour le moteur en mémoire, 'pydcop' (ou un
+            PydcopRunner configuré) pour l'exécutable pydcop.
+        cache (SolutionCache): Cache optionnel des solutions de DCOP de même structure.
 
-# Paramètres de l'expérimentation
-num_satellites = 5
-num_exclusive_users = 4
-num_tasks_per_user = 20  # Nombre de requêtes par utilisateur exclusif
-
-# Générer l'instance EOSCSP
-instance = generator.Instance.generate(num_satellites, num_exclusive_users, num_tasks_per_user)
+    Returns:
+        dict: {user_id: {observation_id: True}} pour chaque observation acceptée.
+    """
+    key, assignments = _cache_lookup(cache, dcop_problem, algorithm, backend)
+    if assignments is None:
+        assignments = _solve_DCOP_backend(dcop_problem, algorithm, backend)
+        _cache_store(cache, key, dcop_problem, assignments)
+    return format_DCOP_result(assignments)
+
+def _cache_lookup(cache, dcop_problem, algorithm, backend):
+    # Retourne (clé, affectations en cache ou None) ; clé None si le DCOP ne se met pas en cache
+    if cache is None or not isinstance(dcop_problem, DCOPModel):
+        return None, None
+    key = dcop_engine.canonical_key(dcop_problem, algorithm, backend)
+    values = cache.get(key)
+    tracer = tracing.active()
+    if tracer.enabled:
+        tracer.count("cache.misses" if values is None else "cache.hits")
+    if values is None:
+        return key, None
+    return key, dict(zip(dcop_problem.variables, values))
+
+def _cache_store(cache, key, dcop_problem, assignments):
+    if key is not None:
+        cache.put(key, tuple(int(assignments.get(name, 0)) for name in dcop_problem.variables))
+
+def _solve_DCOP_backend(dcop_problem, algorithm, backend):
+    with tracing.active().phase("solve_DCOP", algorithm=algorithm, backend=backend if isinstance(backend, str) else type(backend).__name__):
+        return _run_DCOP_backend(dcop_problem, algorithm, backend)
+
+def _run_DCOP_backend(dcop_problem, algorithm, backend):
+    if backend == 'native':
+        model = dcop_problem if isinstance(dcop_problem, DCOPModel) else load_yaml(dcop_problem)
+        assignments = dcop_engine.solve(model, algorithm)
+    elif backend == 'pydcop':
+        assignments = solve_DCOP_pydcop(dcop_problem, algorithm)
+    elif isinstance(backend, PydcopRunner):
+        assignments = solve_DCOP_pydcop(dcop_problem, algorithm, backend)
+    else:
+        raise ValueError(f"Backend DCOP inconnu : {backend}")
+    return assignments
+
+def solve_DCOP_pydcop(dcop_problem, algorithm='dpop', runner=None):
+    if runner is None:
+        runner = PydcopRunner()
+    return runner.solve(dcop_problem, algorithm)
+
+def solve_DCOP_batch(dcop_problems, algorithm='dpop', runner=None, cache=None):
+    """
+    Résout avec pydcop plusieurs DCOP indépendants, en recouvrant les processus.
 
-# Appliquer l'algorithme s_dcop EOSCSP solver
-solution = s_dcop_eoscsp_solver(instance)
+    Args:
+        dcop_problems (list): DCOPModel ou chemins de fichiers YAML.
+        algorithm (str): Algorithme pydcop à utiliser.
+        runner (PydcopRunner | str): Exécuteur à utiliser (concurrence, délai, exécutable),
+            ou 'pydcop' (défaut) pour l'exécuteur par défaut.
+        cache (SolutionCache): Cache optionnel ; seuls les DCOP absents du cache sont résolus.
 
-# Afficher ou analyser la solution
-print(solution)
\ No newline at end of file
+    Returns:
+        list: Un résultat formaté {user_id: {observation_id: True}} par problème.
+    """
+    if runner is None:
+        runner = 'pydcop'
+    if runner == 'pydcop':
+        executor = PydcopRunner()
+    elif isinstance(runner, PydcopRunner):
+        executor = runner
+    else:
+        raise ValueError(f"Backend DCOP inconnu : {runner}")
+
+    lookups = [_cache_lookup(cache, dcop_problem, algorithm, runner) for dcop_problem in dcop_problems]
+    missing = [i for i, (_, assignments) in enumerate(lookups) if assignments is None]
+    results = [assignments for _, assignments in lookups]
+    if missing:
+        with tracing.active().phase("solve_DCOP_batch", algorithm=algorithm, problems=len(missing)):
+            solved = executor.solve_many([dcop_problems[i] for i in missing], algorithm)
+        for i, assignments in zip(missing, solved):
+            _cache_store(cache, lookups[i][0], dcop_problems[i], assignments)
+            results[i] = assignments
+    return [format_DCOP_result(assignments) for assignments in results]
+
+
+
+if __name__ == "__main__":
+    # Paramètres de l'expérimentation
+    num_satellites = 5
+    num_exclusive_users = 4
+    num_tasks_per_user = 20  # Nombre de requêtes par utilisateur exclusif
+
+    # Générer l'instance EOSCSP
+    instance = generator.Instance.generate(num_satellites, num_exclusive_users, num_tasks_per_user)
+
+    # Appliquer l'algorithme s_dcop EOSCSP solver
+    solution = s_dcop_eoscsp_solver(instance)
+
+    # Afficher ou analyser la solution
+    print(solution)
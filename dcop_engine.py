@@ -0,0 +1,246 @@
+import random
+from collections import OrderedDict
+
+
+def pseudo_tree_order(model):
+    """
+    Ordonne les variables par un parcours en profondeur du graphe de contraintes,
+    comme la construction du pseudo-arbre de DPOP, pour garder les séparateurs petits.
+    """
+    rank = {v: i for i, v in enumerate(model.variables)}
+    neighbours = {v: set() for v in model.variables}
+    for constraint in model.constraints:
+        for v in constraint.scope:
+            neighbours[v].update(constraint.scope)
+    order = []
+    visited = set()
+    for root in sorted(model.variables, key=lambda v: -len(neighbours[v])):
+        if root in visited:
+            continue
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            if v in visited:
+                continue
+            visited.add(v)
+            order.append(v)
+            # Départager par ordre de création : l'ordre ne dépend pas des noms des variables
+            stack.extend(sorted(neighbours[v] - visited, key=lambda u: (len(neighbours[u]), rank[u])))
+    return order
+
+
+def solve_dpop(model):
+    """
+    Résolution exacte par programmation dynamique le long du pseudo-arbre (DPOP).
+
+    Les contraintes étant des sommes bornées, un message UTIL ne dépend que du
+    nombre de variables à 1 dans chaque contrainte ouverte : les tables sont
+    indexées par ces compteurs plutôt que par les affectations du séparateur.
+
+    Args:
+        model (DCOPModel): Problème DCOP.
+
+    Returns:
+        dict: Affectation optimale {variable: 0 ou 1}.
+    """
+    order = pseudo_tree_order(model)
+    utilities = model.utilities
+    position = {v: i for i, v in enumerate(order)}
+    constraints = [c for c in model.constraints if c.scope]
+    for c in constraints:
+        if c.bound < 0:
+            raise ValueError(f"Contrainte insatisfiable : {c.name}")
+    first = [min(position[v] for v in c.scope) for c in constraints]
+    last = [max(position[v] for v in c.scope) for c in constraints]
+    constraints_of = [[] for _ in order]
+    for k, c in enumerate(constraints):
+        for v in c.scope:
+            constraints_of[position[v]].append(k)
+
+    # Contraintes ouvertes à la frontière i (avant de traiter la variable i)
+    open_at = [[k for k in range(len(constraints)) if first[k] < i <= last[k]] for i in range(len(order) + 1)]
+
+    # Phase UTIL : états = compteurs des contraintes ouvertes
+    levels = [{(): (0, None, None)}]
+    for i, v in enumerate(order):
+        utility = utilities.get(v, 0)
+        next_open = open_at[i + 1]
+        states = {}
+        for state, (value, _, _) in levels[-1].items():
+            counts = dict(zip(open_at[i], state))
+            for x in (0, 1):
+                new_counts = dict(counts)
+                feasible = True
+                for k in constraints_of[i]:
+                    new_counts[k] = new_counts.get(k, 0) + x
+                    if new_counts[k] > constraints[k].bound:
+                        feasible = False
+                        break
+                if not feasible:
+                    continue
+                new_state = tuple(new_counts.get(k, 0) for k in next_open)
+                new_value = value + utility * x
+                if new_state not in states or new_value > states[new_state][0]:
+                    states[new_state] = (new_value, state, x)
+        levels.append(states)
+
+    # Phase VALUE : remonter les meilleures décisions
+    assignment = {}
+    state = ()
+    for i in range(len(order), 0, -1):
+        _, state, x = levels[i][state]
+        assignment[order[i - 1]] = x
+    return assignment
+
+
+def solve_dsa(model, max_iterations=200, probability=0.7, seed=None):
+    """
+    Résolution approchée et interruptible par DSA (variante B).
+
+    Chaque variable change de valeur avec une probabilité donnée lorsque cela
+    améliore son coût local (ou le laisse inchangé en présence d'une violation).
+    La meilleure affectation réalisable rencontrée est retournée.
+
+    Args:
+        model (DCOPModel): Problème DCOP.
+        max_iterations (int): Nombre maximal de cycles synchrones.
+        probability (float): Probabilité d'activation d'une variable par cycle.
+        seed (int): Graine du générateur aléatoire.
+
+    Returns:
+        dict: Affectation {variable: 0 ou 1}.
+    """
+    rng = random.Random(seed)
+    utilities = model.utilities
+    constraints_of = {v: [] for v in model.variables}
+    for k, c in enumerate(model.constraints):
+        for v in c.scope:
+            constraints_of[v].append(k)
+    penalty = 1 + sum(abs(u) for u in utilities.values())
+
+    assignment = {v: 0 for v in model.variables}
+    counts = [0] * len(model.constraints)
+    violations = sum(1 for c in model.constraints if c.bound < 0)
+    utility = 0
+    best, best_utility = dict(assignment), (0 if violations == 0 else None)
+
+    def delta(v):
+        # Variation du coût (pénalités - utilité) si v change de valeur
+        step = 1 - 2 * assignment[v]
+        d = -step * utilities.get(v, 0)
+        for k in constraints_of[v]:
+            bound = model.constraints[k].bound
+            before = counts[k] > bound
+            after = counts[k] + step > bound
+            d += penalty * (after - before)
+        return d
+
+    for _ in range(max_iterations):
+        candidates = []
+        for v in model.variables:
+            d = delta(v)
+            in_conflict = any(counts[k] > model.constraints[k].bound for k in constraints_of[v])
+            if d < 0 or (d == 0 and in_conflict):
+                candidates.append(v)
+        if not candidates:
+            break
+        moves = [v for v in candidates if rng.random() < probability]
+        for v in moves:
+            step = 1 - 2 * assignment[v]
+            for k in constraints_of[v]:
+                bound = model.constraints[k].bound
+                violations += (counts[k] + step > bound) - (counts[k] > bound)
+                counts[k] += step
+            assignment[v] += step
+            utility += step * utilities.get(v, 0)
+        if violations == 0 and (best_utility is None or utility > best_utility):
+            best, best_utility = dict(assignment), utility
+    return best
+
+
+ALGORITHMS = {
+    "dpop": solve_dpop,
+    "dsa": solve_dsa,
+}
+
+
+def solve(model, algorithm="dpop", **params):
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algorithme {algorithm} non disponible dans le moteur natif")
+    return ALGORITHMS[algorithm](model, **params)
+
+
+def canonical_key(model, *tags):
+    """
+    Clé d'un DCOP indépendante des identifiants des observations.
+
+    Les variables sont numérotées dans leur ordre de création ; la clé couvre leur
+    agent, la structure des contraintes et leurs bornes (dont les capacités
+    restantes des satellites). Les utilités sont divisées par la plus grande, et
+    les contraintes toujours satisfaites ou impliquées par une autre sont
+    ignorées : ni l'un ni l'autre ne change les solutions optimales. Deux DCOP de
+    même clé ont donc les mêmes solutions, à un renommage des variables près.
+    """
+    index = {name: i for i, name in enumerate(model.variables)}
+    scale = max((abs(v.utility) for v in model.variables.values()), default=0) or 1
+    variables = tuple((v.agent, v.utility / scale) for v in model.variables.values())
+
+    constraints = set()
+    for c in model.constraints:
+        scope = frozenset(index[name] for name in c.scope)
+        if c.bound < len(scope):
+            constraints.add((scope, c.bound))
+    # Une contrainte est impliquée par une autre de portée plus large et de borne plus petite
+    kept = [(tuple(sorted(scope)), bound) for scope, bound in constraints
+            if not any(other != (scope, bound) and scope <= other[0] and other[1] <= bound for other in constraints)]
+    return tags + (variables, tuple(sorted(kept)))
+
+
+class SolutionCache:
+    """
+    Cache LRU borné des solutions de DCOP, indexé par canonical_key.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        values = self._entries.get(key)
+        if values is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return values
+
+    def put(self, key, values):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = values
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def copy(self):
+        """
+        Copie des entrées, compteurs remis à zéro (cache envoyé à un processus de travail).
+        """
+        cache = SolutionCache(self.maxsize)
+        cache._entries = OrderedDict(self._entries)
+        return cache
+
+    def merge(self, other):
+        """
+        Ajoute les compteurs et les nouvelles entrées d'une copie (voir copy).
+        """
+        self.hits += other.hits
+        self.misses += other.misses
+        for key, values in other._entries.items():
+            if key not in self._entries:
+                self.put(key, values)
@@ -0,0 +1,144 @@
+import json
+import re
+
+import yaml
+
+
+class Domain:
+    def __init__(self, name, values):
+        self.name = name
+        self.values = values
+
+
+BINARY = Domain("binary", [0, 1])
+
+
+class Variable:
+    """
+    Variable x_{agent}_{observation} : l'agent accepte (1) ou non (0) de réaliser
+    l'observation dans sa fenêtre exclusive.
+    """
+
+    def __init__(self, name, domain, agent, observation=None, utility=0):
+        self.name = name
+        self.domain = domain
+        self.agent = agent
+        self.observation = observation
+        self.utility = utility
+
+
+class Constraint:
+    """
+    Contrainte dure sum(scope) <= bound sur des variables binaires.
+    """
+
+    def __init__(self, name, scope, bound):
+        self.name = name
+        self.scope = scope
+        self.bound = bound
+
+
+class DCOPModel:
+    def __init__(self, name="EOSCSP"):
+        self.name = name
+        self.domains = {BINARY.name: BINARY}
+        self.variables = {}
+        self.constraints = []
+        self.agents = []
+
+    @property
+    def utilities(self):
+        return {name: v.utility for name, v in self.variables.items() if v.utility}
+
+    def add_variable(self, variable):
+        if variable.agent not in self.agents:
+            self.agents.append(variable.agent)
+        self.variables[variable.name] = variable
+
+    def add_constraint(self, constraint):
+        self.constraints.append(constraint)
+
+    def _hard_cost(self):
+        # Coût d'une violation : plus grand que toute récompense atteignable
+        return 1 + sum(abs(v.utility) for v in self.variables.values())
+
+    def to_yaml(self, path):
+        """
+        Écrit le DCOP au format YAML de pydcop (objectif min : les récompenses sont
+        des coûts négatifs et les contraintes dures un coût prohibitif).
+
+        Args:
+            path (str): Chemin du fichier à écrire.
+
+        Returns:
+            str: Le chemin du fichier écrit.
+        """
+        hard_cost = self._hard_cost()
+        with open(path, "w") as f:
+            f.write(f"name: {self.name}\nobjective: min\n\ndomains:\n")
+            for domain in self.domains.values():
+                f.write(f"  {domain.name}:\n    values: {list(domain.values)}\n")
+            f.write("\nvariables:\n")
+            for variable in self.variables.values():
+                f.write(f"  {variable.name}:\n    domain: {variable.domain.name}\n")
+            f.write("\nconstraints:\n")
+            for constraint in self.constraints:
+                f.write(f"  {constraint.name}:\n    type: intention\n")
+                f.write(f"    function: '0 if sum([{','.join(constraint.scope)}]) <= {constraint.bound} else {hard_cost}'\n")
+            for variable in self.variables.values():
+                if variable.utility:
+                    f.write(f"  reward_{variable.name}:\n    type: intention\n")
+                    f.write(f"    function: '-{variable.utility} * {variable.name}'\n")
+            f.write("\nagents:\n")
+            for agent_id in self.agents:
+                f.write(f"  - {agent_id}\n")
+        return path
+
+    def to_json(self, path):
+        content = {
+            "name": self.name,
+            "domains": {d.name: list(d.values) for d in self.domains.values()},
+            "variables": {v.name: {"domain": v.domain.name, "agent": v.agent, "utility": v.utility} for v in self.variables.values()},
+            "constraints": {c.name: {"scope": c.scope, "bound": c.bound} for c in self.constraints},
+            "agents": self.agents,
+        }
+        with open(path, "w") as f:
+            json.dump(content, f)
+        return path
+
+
+_SUM_FUNCTION = re.compile(r"^\s*(?:0 if )?sum\(\[(.*)\]\)\s*<=\s*(-?\d+)(?: else \S+)?\s*$")
+_REWARD_FUNCTION = re.compile(r"^\s*-(\S+) \* (\S+)\s*$")
+
+
+def load_yaml(dcop_yaml_file):
+    """
+    Recharge en mémoire un DCOP écrit par DCOPModel.to_yaml (ou par l'ancien build_DCOP_yaml).
+
+    Args:
+        dcop_yaml_file (str): Chemin du fichier YAML.
+
+    Returns:
+        DCOPModel: Le problème DCOP correspondant.
+    """
+    with open(dcop_yaml_file, "r") as f:
+        content = yaml.safe_load(f)
+
+    model = DCOPModel(content.get("name", "EOSCSP"))
+    for name in (content.get("variables") or {}):
+        agent, _ = name[len("x_"):].rsplit("_obs_", 1)
+        model.add_variable(Variable(name, BINARY, agent))
+    for name, constraint in (content.get("constraints") or {}).items():
+        function = str(constraint["function"])
+        match = _SUM_FUNCTION.match(function)
+        if match:
+            scope = [v.strip() for v in match.group(1).split(",") if v.strip()]
+            model.add_constraint(Constraint(name, scope, int(match.group(2))))
+            continue
+        match = _REWARD_FUNCTION.match(function)
+        if match and match.group(2) in model.variables:
+            model.variables[match.group(2)].utility = float(match.group(1))
+            continue
+        raise ValueError(f"Contrainte non supportée par le moteur natif : {name}")
+    model.agents = list(content.get("agents") or model.agents)
+    return model
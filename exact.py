@@ -0,0 +1,245 @@
+import time
+
+import tracing
+from conflicts import satellite_components
+from schedule import Schedule
+
+
+def decompose_by_satellite(requests):
+    """
+    Regroupe les requêtes qui partagent un satellite (union-find) : deux composantes
+    n'ont ni plan ni capacité en commun et se résolvent indépendamment.
+
+    Returns:
+        list: Les composantes, chacune étant une liste de requêtes dans l'ordre d'entrée.
+    """
+    components = satellite_components(requests, lambda r: [o.satellite_o.id for o in r.observation_opportunities])
+    return [[requests[i] for i in component] for component in components]
+
+
+def distinct_opportunities(r):
+    # Dominance : des opportunités identiques (même satellite, même fenêtre) mènent au même sous-arbre
+    seen = set()
+    opportunities = []
+    for o in sorted(r.observation_opportunities, key=lambda o: o.t_start_o):
+        key = (o.satellite_o.id, o.t_start_o, o.t_end_o, o.duration_o)
+        if key not in seen:
+            seen.add(key)
+            opportunities.append(o)
+    return opportunities
+
+
+class BranchAndBound:
+    """
+    Recherche arborescente exacte (séparation et évaluation, en profondeur) sur les
+    requêtes d'une composante, par date de début de leur première opportunité.
+
+    À chaque requête, les branches sont ses opportunités distinctes encore
+    réalisables (placées au plus tôt, comme first_slot), puis « non servie ».
+    Un nœud est élagué :
+        - lorsque sa borne supérieure ne dépasse pas la meilleure solution connue.
+          La borne relâche la contrainte « une observation par requête » entre
+          satellites : pour chaque satellite, les requêtes restantes encore plaçables
+          sur ce satellite, dans la limite de sa capacité restante, par récompense
+          décroissante. Une requête non plaçable à un nœud ne l'est plus dans son
+          sous-arbre, qui ne fait qu'ajouter des observations ;
+        - lorsqu'il est dominé : un nœud déjà visité au même niveau avait la même
+          charge sur chaque satellite, les mêmes observations encore susceptibles de
+          gêner les opportunités restantes, et une récompense au moins égale.
+
+    La recherche est exacte lorsque la fenêtre de chaque opportunité fixe sa date
+    de début (fenêtre de la durée de l'observation, comme dans les générateurs) ;
+    sinon, elle est exacte pour la politique de placement au plus tôt.
+
+    Args:
+        requests (list): Requêtes de la composante.
+        R (Schedule): Plan dans lequel les placements sont explorés (vide au départ).
+        incumbent (list): Solution initiale [(observation, t)] de la composante, facultative.
+    """
+
+    def __init__(self, requests, R, incumbent=None):
+        self.R = R
+        # L'ordre chronologique rend les conflits locaux et les états dominés fréquents
+        self.requests = sorted(requests, key=lambda r: (min(o.t_start_o for o in r.observation_opportunities), r.id))
+        self.options = [distinct_opportunities(r) for r in self.requests]
+        self.rewards = [r.observation_opportunities[0].reward_o for r in self.requests]
+        self.satellites = {o.satellite_o.id: o.satellite_o for options in self.options for o in options}
+        # Pour chaque satellite : (récompense, indice de la requête, opportunités sur ce satellite), par récompense décroissante
+        self.candidates = {satellite_id: [] for satellite_id in self.satellites}
+        for i, options in enumerate(self.options):
+            by_satellite = {}
+            for o in options:
+                by_satellite.setdefault(o.satellite_o.id, []).append(o)
+            for satellite_id, satellite_options in by_satellite.items():
+                self.candidates[satellite_id].append((self.rewards[i], i, satellite_options))
+        for candidates in self.candidates.values():
+            candidates.sort(key=lambda c: -c[0])
+        self.suffix_reward = [0] * (len(self.requests) + 1)
+        for i in range(len(self.requests) - 1, -1, -1):
+            self.suffix_reward[i] = self.suffix_reward[i + 1] + self.rewards[i]
+
+        # Plus petite date de début des opportunités des requêtes d'indice >= i
+        self.suffix_start = [float("inf")] * (len(self.requests) + 1)
+        for i in range(len(self.requests) - 1, -1, -1):
+            self.suffix_start[i] = min([self.suffix_start[i + 1]] + [o.t_start_o for o in self.options[i]])
+        self.satellite_ids = sorted(self.satellites)
+        self.visited = {}
+
+        self.best = list(incumbent) if incumbent else []
+        self.best_reward = sum(o.reward_o for o, _ in self.best)
+        self.nodes = 0
+        self.complete = False
+        self.upper_bound = self.bound(0)
+
+    def bound(self, level):
+        """
+        Borne supérieure de la récompense atteignable par les requêtes d'indice >= level.
+        """
+        total = 0
+        for satellite_id, candidates in self.candidates.items():
+            timeline = self.R[satellite_id]
+            k = self.R.remaining_capacity(self.satellites[satellite_id])
+            for reward, i, options in candidates:
+                if k <= 0:
+                    break
+                if i >= level and any(timeline.earliest_start(o) is not None for o in options):
+                    total += reward
+                    k -= 1
+        return min(total, self.suffix_reward[level])
+
+    def state(self, level):
+        # Charge de chaque satellite et observations pouvant encore gêner les requêtes restantes
+        t = self.suffix_start[level]
+        state = [level]
+        for satellite_id in self.satellite_ids:
+            timeline = self.R[satellite_id]
+            state.append(len(timeline))
+            state.extend((timeline.start_of(o), o.duration_o) for o in timeline.conflicts(t, float("inf")))
+            state.append(None)
+        return tuple(state)
+
+    def dominated(self, level, reward):
+        key = self.state(level)
+        if self.visited.get(key, -1) >= reward:
+            return True
+        self.visited[key] = reward
+        return False
+
+    def solve(self, node_limit=None, deadline=None):
+        """
+        Explore l'arbre jusqu'à la preuve d'optimalité ou à l'épuisement d'une limite.
+
+        Returns:
+            bool: True si l'optimalité de la meilleure solution est prouvée.
+        """
+        n = len(self.requests)
+        placed = []
+        reward = 0
+        # Pile des nœuds ouverts : [niveau, branches restantes, observation placée, borne du nœud]
+        frames = []
+        level = 0
+        while True:
+            # Entrée dans le nœud du niveau level
+            self.nodes += 1
+            node_bound = reward + self.bound(level) if level < n else reward
+            if reward > self.best_reward:
+                self.best_reward = reward
+                self.best = [(o, self.R[o.satellite_o.id].start_of(o)) for o in placed]
+            if level < n and node_bound > self.best_reward and not self.dominated(level, reward):
+                options = [o for o in self.options[level]
+                           if self.R.remaining_capacity(o.satellite_o) > 0
+                           and self.R[o.satellite_o.id].earliest_start(o) is not None]
+                frames.append([level, options + [None], None, node_bound])
+
+            # Branche suivante du nœud ouvert le plus profond
+            while frames:
+                if (node_limit is not None and self.nodes >= node_limit) or \
+                        (deadline is not None and self.nodes % 256 == 0 and time.perf_counter() >= deadline):
+                    self.upper_bound = max([self.best_reward] + [f[3] for f in frames if f[3] > self.best_reward])
+                    self._unwind(frames, placed)
+                    return False
+                frame = frames[-1]
+                if frame[2] is not None:
+                    o = frame[2]
+                    self.R.unassign(o)
+                    placed.pop()
+                    reward -= o.reward_o
+                    frame[2] = None
+                if not frame[1] or frame[3] <= self.best_reward:
+                    frames.pop()
+                    continue
+                o = frame[1].pop(0)
+                level = frame[0] + 1
+                if o is not None:
+                    satellite_id = o.satellite_o.id
+                    self.R.assign(o, (satellite_id, self.R[satellite_id].earliest_start(o)), o.user_o.id)
+                    placed.append(o)
+                    reward += o.reward_o
+                    frame[2] = o
+                break
+            else:
+                self.upper_bound = self.best_reward
+                self.complete = True
+                return True
+
+    def _unwind(self, frames, placed):
+        for frame in reversed(frames):
+            if frame[2] is not None:
+                self.R.unassign(frame[2])
+        placed.clear()
+
+
+def _placements(R):
+    for timeline in R.timelines.values():
+        yield from timeline
+
+
+def solve_exact(instance, node_limit=None, time_limit=None, incumbent=None):
+    """
+    Résout exactement une instance EOSCSP (récompense totale maximale), composante
+    par composante, avec des limites de nœuds et de temps communes à toutes les
+    composantes.
+
+    Le modèle est celui du solveur glouton : une observation au plus par requête,
+    temps de transition et capacité de chaque satellite ; la récompense est
+    comparable à celle du plan complet du solveur s-DCOP (online.schedule_quality).
+
+    Args:
+        instance (generator.Instance): Instance à résoudre.
+        node_limit (int): Nombre maximal de nœuds explorés.
+        time_limit (float): Durée maximale en secondes.
+        incumbent (Schedule): Plan réalisable servant de solution initiale (par exemple
+            celui de dcop.s_dcop_schedule) ; il est retourné, par composante, si la
+            recherche ne l'améliore pas avant d'atteindre une limite.
+
+    Returns:
+        tuple: (Schedule de la meilleure solution trouvée, statistiques : récompense,
+            borne supérieure, écart relatif, nœuds, optimal).
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + time_limit if time_limit is not None else None
+    R = Schedule(instance.satellites)
+    stats = {"reward": 0, "upper_bound": 0, "nodes": 0, "components": 0, "optimal": True}
+    with tracing.active().phase("exact"):
+        for requests in decompose_by_satellite(instance.tasks):
+            start = None
+            if incumbent is not None:
+                component = set(requests)
+                start = [(o, t) for o, (_, t) in _placements(incumbent) if o.request_o in component]
+            search = BranchAndBound(requests, Schedule(instance.satellites), start)
+            remaining = node_limit - stats["nodes"] if node_limit is not None else None
+            if (remaining is None or remaining > 0) and (deadline is None or time.perf_counter() < deadline):
+                search.solve(remaining, deadline)
+            for o, t in search.best:
+                R.assign(o, (o.satellite_o.id, t), o.user_o.id)
+            stats["reward"] += search.best_reward
+            stats["upper_bound"] += search.upper_bound
+            stats["nodes"] += search.nodes
+            stats["components"] += 1
+            stats["optimal"] = stats["optimal"] and search.complete
+    stats["gap"] = (stats["upper_bound"] - stats["reward"]) / stats["upper_bound"] if stats["upper_bound"] else 0.0
+    stats["time"] = time.perf_counter() - t0
+    tracer = tracing.active()
+    if tracer.enabled:
+        tracer.emit("exact", **stats)
+    return R, stats
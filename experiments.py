@@ -0,0 +1,178 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import dcop
+import generator
+import tracing
+from benchmark import greedy_phases, solution_quality
+from exact import solve_exact
+from online import schedule_quality
+from validation import validate_schedule
+
+
+def solve_greedy(instance, params):
+    R, _ = greedy_phases(instance)
+    return R, {}
+
+
+def solve_s_dcop(instance, params):
+    return dcop.s_dcop_schedule(instance, params.get("algorithm", "dpop")), {}
+
+
+def solve_s_dcop_lns(instance, params):
+    time_limit, iterations = params.get("time_limit"), params.get("iterations")
+    if time_limit is None and iterations is None:
+        iterations = 1000
+    R = dcop.s_dcop_schedule(instance, params.get("algorithm", "dpop"), improve_time=time_limit,
+                             improve_iterations=iterations, seed=params["seed"])
+    return R, {}
+
+
+def solve_exact_reference(instance, params):
+    R, stats = solve_exact(instance, time_limit=params.get("time_limit"),
+                           incumbent=dcop.s_dcop_schedule(instance))
+    return R, {"upper_bound": stats["upper_bound"], "gap": stats["gap"], "optimal": stats["optimal"]}
+
+
+SOLVERS = {
+    "greedy": solve_greedy,
+    "s-dcop": solve_s_dcop,
+    "s-dcop-lns": solve_s_dcop_lns,
+    "exact": solve_exact_reference,
+}
+
+
+def job_key(job):
+    return json.dumps(job, sort_keys=True)
+
+
+def run_job(job):
+    """
+    Génère l'instance d'une tâche (configuration, graine) et la résout.
+
+    Exécuté dans un processus de travail : l'instance est générée sur place, seules
+    les métriques reviennent au processus principal.
+
+    Args:
+        job (dict): num_satellites, num_exclusive_users, num_tasks_per_user, seed,
+            solver et paramètres éventuels du solveur (algorithm, time_limit, iterations).
+
+    Returns:
+        dict: Les métriques de la tâche.
+    """
+    random.seed(job["seed"])
+    instance = generator.Instance.generate(job["num_satellites"], job["num_exclusive_users"], job["num_tasks_per_user"])
+    t0 = time.perf_counter()
+    R, stats = SOLVERS[job["solver"]](instance, job)
+    elapsed = time.perf_counter() - t0
+
+    record = {}
+    record["num_requests"] = len(instance.tasks)
+    record["num_observations"] = len(instance.observation_opportunities)
+    record["time"] = elapsed
+    record["served"], record["reward"] = schedule_quality(R)
+    record["central_reward"], record["central_served"] = solution_quality(R.solution())
+    record["violations"] = sum(len(rows) for rows in validate_schedule(R, instance).values())
+    record.update(stats)
+    return record
+
+
+def completed_jobs(path):
+    """
+    Clés des tâches déjà enregistrées dans un fichier JSONL (pour la reprise).
+
+    Une dernière ligne tronquée (balayage interrompu en cours d'écriture) et les
+    tâches en erreur sont ignorées : elles seront relancées.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "error" not in record:
+                done.add(job_key(record["job"]))
+    return done
+
+
+def make_jobs(num_satellites_values, num_exclusive_users_values, tasks_per_user_values, solvers, seeds, **params):
+    jobs = []
+    for num_satellites, num_exclusive_users, num_tasks_per_user, solver, seed in itertools.product(
+            num_satellites_values, num_exclusive_users_values, tasks_per_user_values, solvers, seeds):
+        job = {
+            "num_satellites": num_satellites,
+            "num_exclusive_users": num_exclusive_users,
+            "num_tasks_per_user": num_tasks_per_user,
+            "solver": solver,
+            "seed": seed,
+        }
+        job.update({name: value for name, value in params.items() if value is not None})
+        jobs.append(job)
+    return jobs
+
+
+def run_experiments(jobs, path, max_workers=None):
+    """
+    Résout les tâches sur un pool de processus et ajoute une ligne JSON par tâche
+    terminée à path, dès sa fin. Les tâches déjà présentes dans path sont sautées.
+
+    Returns:
+        int: Nombre de tâches exécutées.
+    """
+    done = completed_jobs(path)
+    pending = [job for job in jobs if job_key(job) not in done]
+    if not pending:
+        return 0
+    # Un fichier interrompu au milieu d'une ligne doit reprendre sur une nouvelle ligne
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            newline = f.read(1) != b"\n"
+    else:
+        newline = False
+
+    with open(path, "a") as out, ProcessPoolExecutor(max_workers=max_workers, initializer=tracing.reset_worker) as executor:
+        if newline:
+            out.write("\n")
+        futures = {executor.submit(run_job, job): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                record = {"job": job, **future.result()}
+            except Exception as e:
+                record = {"job": job, "error": repr(e)}
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+    return len(pending)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Résolution d'instances EOSCSP aléatoires en parallèle")
+    parser.add_argument("--satellites", type=int, nargs="+", default=[5])
+    parser.add_argument("--users", type=int, nargs="+", default=[4])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[20])
+    parser.add_argument("--solvers", nargs="+", default=["greedy", "s-dcop"], choices=sorted(SOLVERS))
+    parser.add_argument("--seeds", type=int, default=100, help="Nombre d'instances par configuration")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--algorithm", default=None, help="Algorithme DCOP (dpop ou dsa)")
+    parser.add_argument("--time-limit", type=float, default=None, help="Budget (s) de la recherche locale ou du solveur exact")
+    parser.add_argument("--iterations", type=int, default=None, help="Budget en mouvements de la recherche locale")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="experiments.jsonl")
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.satellites, args.users, args.tasks, args.solvers,
+                     range(args.first_seed, args.first_seed + args.seeds),
+                     algorithm=args.algorithm, time_limit=args.time_limit, iterations=args.iterations)
+    t0 = time.perf_counter()
+    count = run_experiments(jobs, args.output, args.workers)
+    print(f"{count} instance(s) résolue(s) en {time.perf_counter() - t0:.1f}s, "
+          f"{len(jobs) - count} déjà présente(s) dans {args.output}")
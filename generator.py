@@ -1,4 +1,5 @@
 from asyncio import tasks
+import bisect
 import random
 import time
 
@@ -35,7 +36,7 @@ class User:
 
     @staticmethod
     def generate_exclusive_users(num_exclusive_users, satellites, total_time=300):
-        exclusive_windows_all_users = []
+        exclusive_windows_by_satellite = {}
         users = []
         available_priorities = list(range(1, num_exclusive_users + 2))
         used_satellites = set()
@@ -46,10 +47,12 @@ class User:
             exclusive_windows = []
             for satellite in random.sample(satellites, random.randint(1, len(satellites))):
                 if satellite.id not in used_satellites:
-                    windows = generate_exclusive_windows(8, (15, 20), total_time, exclusive_windows_all_users)
+                    # Les fenêtres ne doivent être disjointes que sur un même satellite
+                    satellite_windows = exclusive_windows_by_satellite.setdefault(satellite.id, [])
+                    windows = generate_exclusive_windows(8, (15, 20), total_time, satellite_windows)
                     if windows:
                         exclusive_windows.extend([(satellite.id, start, end) for start, end in windows])
-                        exclusive_windows_all_users.extend(windows)
+                        satellite_windows.extend(windows)
                         used_satellites.add(satellite.id)
             users.append(User(
                 id=f"exclusive_user_{i}",
@@ -67,13 +70,56 @@ class User:
         return users
 
 
-def generate_exclusive_windows(num_windows, window_length_range, total_time, existing_windows):
+def generate_exclusive_windows(num_windows, window_length_range, total_time, existing_windows, rng=random):
+    """
+    Tire des fenêtres exclusives disjointes dans [0, total_time] sans chevaucher les fenêtres existantes.
+
+    Les intervalles libres sont tenus dans une liste triée : chaque fenêtre est tirée
+    directement dans le temps libre restant, sans tirage par rejet.
+
+    Args:
+        num_windows (int): Nombre de fenêtres à tirer.
+        window_length_range (tuple): Longueurs minimale et maximale d'une fenêtre.
+        total_time (float): Horizon de planification.
+        existing_windows (list): Fenêtres (start, end) déjà occupées.
+        rng: Le module random ou tout générateur offrant uniform(a, b), comme numpy.random.Generator.
+
+    Returns:
+        list: Les fenêtres (start, end) tirées, dans l'ordre de tirage.
+    """
+    min_length, max_length = window_length_range
+
+    # Intervalles libres triés
+    gaps = []
+    t = 0
+    for existing_start, existing_end in sorted(existing_windows):
+        if existing_start > t:
+            gaps.append((t, existing_start))
+        t = max(t, existing_end)
+    if t < total_time:
+        gaps.append((t, total_time))
+
     windows = []
-    while len(windows) < num_windows:
-        start = random.uniform(0, total_time - window_length_range[1])
-        end = start + random.uniform(*window_length_range)
-        if not any(existing_start <= start < existing_end or existing_start < end <= existing_end for existing_start, existing_end in existing_windows + windows):
-            windows.append((start, end))
+    for _ in range(num_windows):
+        largest_gap = max((gap_end - gap_start for gap_start, gap_end in gaps), default=0)
+        if largest_gap < min_length:
+            raise ValueError(f"Impossible de placer {num_windows} fenêtres exclusives de longueur {min_length} ou plus dans l'horizon {total_time}")
+        length = rng.uniform(min_length, min(max_length, largest_gap))
+
+        # Début uniforme parmi toutes les positions libres où la fenêtre tient
+        fitting = [i for i, (gap_start, gap_end) in enumerate(gaps) if gap_end - gap_start >= length]
+        r = rng.uniform(0, sum(gaps[i][1] - gaps[i][0] - length for i in fitting))
+        for i in fitting:
+            slack = gaps[i][1] - gaps[i][0] - length
+            if r <= slack:
+                break
+            r -= slack
+        gap_start, gap_end = gaps[i]
+        start = gap_start + min(r, gap_end - gap_start - length)
+        end = start + length
+
+        gaps[i:i + 1] = [gap for gap in ((gap_start, start), (end, gap_end)) if gap[1] > gap[0]]
+        windows.append((start, end))
     return windows
 
 class ObservationOpportunity:
@@ -158,12 +204,59 @@ def generate_gps_position():
     altitude = random.uniform(0, 400)
     return latitude, longitude, altitude
 
+class ExclusiveWindowIndex:
+    """
+    Fenêtres exclusives de chaque satellite triées par date de début, pour trouver
+    par dichotomie les fenêtres qui chevauchent une observation.
+    """
+
+    def __init__(self, users):
+        windows = {}
+        for user in users:
+            for satellite_id, start, end in user.exclusive_windows:
+                windows.setdefault(satellite_id, []).append((start, end, user.id))
+        self._windows = {}
+        self._starts = {}
+        self._max_length = {}
+        for satellite_id, satellite_windows in windows.items():
+            satellite_windows.sort()
+            self._windows[satellite_id] = satellite_windows
+            self._starts[satellite_id] = [w[0] for w in satellite_windows]
+            self._max_length[satellite_id] = max(end - start for start, end, _ in satellite_windows)
+
+    def owners(self, satellite_id, t_start, t_end):
+        """
+        Retourne, dans l'ordre des fenêtres, les propriétaires des fenêtres exclusives
+        du satellite qui chevauchent l'intervalle ]t_start, t_end[.
+        """
+        starts = self._starts.get(satellite_id)
+        if not starts:
+            return []
+        windows = self._windows[satellite_id]
+        lo = bisect.bisect_right(starts, t_start - self._max_length[satellite_id])
+        hi = bisect.bisect_left(starts, t_end)
+        owners = []
+        for start, end, user_id in windows[lo:hi]:
+            if end > t_start and user_id not in owners:
+                owners.append(user_id)
+        return owners
+
+    def owners_of(self, o):
+        return self.owners(o.satellite_o.id, o.t_start_o, o.t_end_o)
+
+
 class Instance:
     def __init__(self, satellites, users, tasks, observation_opportunities):
         self.satellites = satellites
         self.users = users
         self.tasks = tasks
         self.observation_opportunities = observation_opportunities
+        # Index construits à la première utilisation
+        self._tasks_by_user = None
+        self._observations_by_user = None
+        self._observations_by_satellite = None
+        self._exclusive_window_index = None
+        self._conflict_graph = None
 
     @staticmethod
     def generate(num_satellites, num_exclusive_users, num_tasks_per_user):
@@ -183,17 +276,63 @@ class Instance:
 
         return Instance(satellites, users, tasks, all_observation_opportunities)
     
-    def filter_by_user(self, user_id):
-        # Filtrer les tâches (requêtes) pour un utilisateur spécifique
-        filtered_tasks = [task for task in self.tasks if task.user.id == user_id]
+    @property
+    def tasks_by_user(self):
+        if self._tasks_by_user is None:
+            self._tasks_by_user = {user.id: [] for user in self.users}
+            for task in self.tasks:
+                self._tasks_by_user.setdefault(task.user.id, []).append(task)
+        return self._tasks_by_user
+
+    @property
+    def observations_by_user(self):
+        if self._observations_by_user is None:
+            observations = self.observation_opportunities
+            if hasattr(observations, "group_by"):
+                # Store colonnes (columnar.OpportunityStore) : un seul tri sur l'indice de l'utilisateur
+                groups = observations.group_by(observations.user, len(observations.users))
+                self._observations_by_user = {user.id: group for user, group in zip(observations.users, groups)}
+            else:
+                self._observations_by_user = {user.id: [] for user in self.users}
+                for obs in observations:
+                    self._observations_by_user.setdefault(obs.user_o.id, []).append(obs)
+        return self._observations_by_user
+
+    @property
+    def observations_by_satellite(self):
+        if self._observations_by_satellite is None:
+            observations = self.observation_opportunities
+            if hasattr(observations, "group_by"):
+                groups = observations.group_by(observations.satellite, len(observations.satellites))
+                self._observations_by_satellite = {satellite.id: group for satellite, group in zip(observations.satellites, groups)}
+            else:
+                self._observations_by_satellite = {satellite.id: [] for satellite in self.satellites}
+                for obs in observations:
+                    self._observations_by_satellite.setdefault(obs.satellite_o.id, []).append(obs)
+        return self._observations_by_satellite
+
+    @property
+    def exclusive_window_index(self):
+        if self._exclusive_window_index is None:
+            self._exclusive_window_index = ExclusiveWindowIndex(self.users)
+        return self._exclusive_window_index
+
+    @property
+    def conflict_graph(self):
+        if self._conflict_graph is None:
+            from conflicts import ConflictGraph
+            self._conflict_graph = ConflictGraph(self.observation_opportunities, self.satellites, self.users)
+        return self._conflict_graph
 
-        # Filtrer les opportunités d'observation associées à ces tâches
-        filtered_obs = [obs for obs in self.observation_opportunities if obs.user_o.id == user_id]
+    def filter_by_user(self, user_id):
+        """
+        Sous-instance réduite aux tâches et opportunités d'un utilisateur.
 
-        # Créer une nouvelle instance avec ces tâches et opportunités d'observation filtrées
-        return Instance(self.satellites, self.users, filtered_tasks, filtered_obs)
+        Les listes retournées sont celles des index de l'instance (construits une
+        seule fois) et sont partagées : elles ne doivent pas être modifiées.
+        """
+        return Instance(self.satellites, self.users, self.tasks_by_user.get(user_id, []), self.observations_by_user.get(user_id, []))
 
-    
     def format_for_display(self):
         formatted_output = "EOSCSP Instance:\n\n"
 
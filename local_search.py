@@ -0,0 +1,258 @@
+import bisect
+import random
+import time
+
+import tracing
+from schedule import CENTRAL_PLANNER
+
+
+class LocalSearch:
+    """
+    Amélioration anytime d'un plan par recherche à grand voisinage (LNS).
+
+    Trois mouvements sont tirés au hasard :
+        - échange : une requête non servie prend la place des observations qui la
+          bloquent sur son satellite, qui sont ensuite replacées ailleurs si possible ;
+        - déplacement : une requête servie passe sur une autre de ses opportunités,
+          et la place libérée est offerte aux requêtes non servies ;
+        - destruction/réparation : une fenêtre de temps d'un satellite est vidée puis
+          remplie à nouveau, par récompense décroissante.
+
+    Toute insertion passe par Timeline.earliest_start et la capacité restante du
+    satellite : les temps de transition et les capacités sont toujours respectés.
+
+    L'objectif est la récompense de la solution du planificateur central
+    (R.solution()), tenue à jour par Schedule à chaque affectation ou retrait
+    (évaluation incrémentale) ; un mouvement qui la dégrade est annulé, si bien que
+    le plan courant est toujours le meilleur trouvé. Une observation n'est insérée
+    que pour un agent qui la fait entrer dans la solution : le planificateur
+    central pour ses requêtes, sinon un utilisateur exclusif dont une fenêtre la
+    chevauche (comme dans build_DCOP). Les affectations propres des utilisateurs
+    exclusifs, hors solution, ne sont délogées que par une requête du
+    planificateur central, qui passe avant elles dans la résolution par lot.
+
+    Args:
+        instance (generator.Instance): Instance résolue.
+        R (Schedule): Plan à améliorer, modifié en place.
+        seed (int): Graine du générateur aléatoire des mouvements.
+    """
+
+    def __init__(self, instance, R, seed=None):
+        self.R = R
+        self.conflict_graph = instance.conflict_graph
+        self.rng = random.Random(seed)
+        self._agent_hint = {}
+        self._unserved = []
+        self._unserved_position = {}
+        # Requêtes servies dans la solution : celles servies par une affectation propre restent en place
+        self._served = []
+        self._served_position = {}
+        for r in instance.tasks:
+            if not R.is_served(r):
+                self._add(self._unserved, self._unserved_position, r)
+            elif not R.is_private(R.assignment_of(r)[0]):
+                self._add(self._served, self._served_position, r)
+
+        # Opportunités de chaque satellite, triées par date de début
+        self._opportunities = {satellite_id: [] for satellite_id in R.timelines}
+        self._window_length = 0
+        for o in instance.observation_opportunities:
+            self._opportunities[o.satellite_o.id].append((o.t_start_o, o))
+            self._window_length = max(self._window_length, o.t_end_o - o.t_start_o)
+        for opportunities in self._opportunities.values():
+            opportunities.sort(key=lambda entry: entry[0])
+        self._starts = {satellite_id: [t for t, _ in opportunities] for satellite_id, opportunities in self._opportunities.items()}
+
+    @property
+    def reward(self):
+        return self.R.solution_quality()[1]
+
+    @staticmethod
+    def _add(items, positions, item):
+        positions[item] = len(items)
+        items.append(item)
+
+    @staticmethod
+    def _discard(items, positions, item):
+        # Retrait en O(1) : le dernier élément prend la place de l'élément retiré
+        i = positions.pop(item, None)
+        if i is None:
+            return
+        last = items.pop()
+        if last is not item:
+            items[i] = last
+            positions[last] = i
+
+    def _assign(self, o, slot, agent_id, log):
+        self.R.assign(o, slot, agent_id)
+        self._discard(self._unserved, self._unserved_position, o.request_o)
+        if not self.R.is_private(o):
+            self._add(self._served, self._served_position, o.request_o)
+        log.append((True, o, slot, agent_id))
+
+    def _unassign(self, o, log):
+        agent_id = self.R.agent_of(o)
+        slot = self.R.unassign(o)
+        self._agent_hint[o] = agent_id
+        self._discard(self._served, self._served_position, o.request_o)
+        self._add(self._unserved, self._unserved_position, o.request_o)
+        log.append((False, o, slot, agent_id))
+
+    def _undo(self, log):
+        for assigned, o, slot, agent_id in reversed(log):
+            if assigned:
+                self._unassign(o, [])
+            else:
+                self._assign(o, slot, agent_id, [])
+
+    def _solution_agent(self, o):
+        # Agent pour lequel l'affectation de o entre dans la solution, None s'il n'y en a pas
+        if o.user_o.id == CENTRAL_PLANNER:
+            return CENTRAL_PLANNER
+        for owner in self.conflict_graph.owners_of(o):
+            if owner != o.user_o.id:
+                return owner
+        return None
+
+    def _removable(self, b, o):
+        # Une affectation propre ne cède sa place qu'au planificateur central
+        return not self.R.is_private(b) or o.user_o.id == CENTRAL_PLANNER
+
+    def _try_insert(self, o, log, agent_id=None):
+        if agent_id is None:
+            # Une observation déjà planifiée garde l'agent qui l'avait acceptée
+            agent_id = self._agent_hint.get(o) or self._solution_agent(o)
+            if agent_id is None:
+                return False
+        satellite = o.satellite_o
+        if self.R.remaining_capacity(satellite) <= 0:
+            return False
+        t = self.R[satellite.id].earliest_start(o)
+        if t is None:
+            return False
+        self._assign(o, (satellite.id, t), agent_id, log)
+        return True
+
+    def _insert_request(self, r, log, exclude=None):
+        for o in r.observation_opportunities:
+            if o != exclude and self._try_insert(o, log):
+                return True
+        return False
+
+    def _unserved_near(self, satellite_id, t_start, t_end):
+        # Requêtes non servies ayant une opportunité sur le satellite qui chevauche [t_start, t_end]
+        starts = self._starts[satellite_id]
+        i = bisect.bisect_left(starts, t_start - self._window_length)
+        j = bisect.bisect_right(starts, t_end)
+        return {o.request_o for _, o in self._opportunities[satellite_id][i:j]
+                if o.request_o in self._unserved_position}
+
+    def _repair(self, requests, log):
+        # Récompense décroissante, départage aléatoire (reproductible pour une graine donnée)
+        order = sorted(sorted(requests, key=lambda r: r.id),
+                       key=lambda r: (-r.observation_opportunities[0].reward_o, self.rng.random()))
+        for r in order:
+            if r in self._unserved_position:
+                self._insert_request(r, log)
+
+    def swap(self, log):
+        if not self._unserved:
+            return
+        r = self.rng.choice(self._unserved)
+        o = self.rng.choice(r.observation_opportunities)
+        agent_id = self._solution_agent(o)
+        if agent_id is None:
+            return
+        satellite = o.satellite_o
+        timeline = self.R[satellite.id]
+        blockers = list(timeline.conflicts(o.t_start_o, o.t_end_o))
+        if not blockers and self.R.remaining_capacity(satellite) <= 0:
+            candidates = [b for b, _ in timeline if self._removable(b, o)]
+            if not candidates:
+                return
+            blockers = [min(candidates, key=lambda b: b.reward_o)]
+        if not all(self._removable(b, o) for b in blockers):
+            return
+        for b in blockers:
+            self._unassign(b, log)
+        if not self._try_insert(o, log, agent_id):
+            return
+        self._repair([b.request_o for b in blockers], log)
+
+    def shift(self, log):
+        if not self._served:
+            return
+        r = self.rng.choice(self._served)
+        o, _ = self.R.assignment_of(r)
+        self._unassign(o, log)
+        if not self._insert_request(r, log, exclude=o):
+            self._try_insert(o, log)
+        # La place libérée ne profite qu'aux opportunités en conflit avec o
+        self._repair({c.request_o for c in self.conflict_graph.conflicts(o)
+                      if c.request_o in self._unserved_position}, log)
+
+    def destroy_repair(self, log):
+        if not self._served:
+            return
+        o, (satellite_id, t) = self.R.assignment_of(self.rng.choice(self._served))
+        satellite = o.satellite_o
+        width = self.rng.uniform(1, 4) * (o.duration_o + satellite.transition_time)
+        t_start, t_end = t - width, t + width
+        removed = [b for b in self.R[satellite_id].conflicts(t_start, t_end) if not self.R.is_private(b)]
+        for b in removed:
+            self._unassign(b, log)
+        self._repair({b.request_o for b in removed} | self._unserved_near(satellite_id, t_start, t_end), log)
+
+    def run(self, time_budget=None, max_iterations=None):
+        """
+        Applique des mouvements jusqu'à épuisement du budget.
+
+        Args:
+            time_budget (float): Durée maximale en secondes.
+            max_iterations (int): Nombre maximal de mouvements (1000 si aucun budget n'est donné).
+
+        Returns:
+            dict: Statistiques : récompense initiale et finale de la solution, mouvements
+            tentés et acceptés.
+        """
+        if time_budget is None and max_iterations is None:
+            max_iterations = 1000
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        moves = (self.swap, self.shift, self.destroy_repair)
+        stats = {"initial_reward": self.reward, "iterations": 0, "accepted": 0, "improving": 0}
+        while max_iterations is None or stats["iterations"] < max_iterations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            reward = self.reward
+            log = []
+            self.rng.choice(moves)(log)
+            stats["iterations"] += 1
+            if self.reward < reward:
+                self._undo(log)
+            elif log:
+                stats["accepted"] += 1
+                stats["improving"] += self.reward > reward
+        stats["reward"] = self.reward
+        return stats
+
+
+def improve_schedule(instance, R, time_budget=None, max_iterations=None, seed=None):
+    """
+    Améliore en place un plan produit par le solveur s-DCOP.
+
+    Args:
+        instance (generator.Instance): Instance résolue.
+        R (Schedule): Plan à améliorer.
+        time_budget (float): Durée maximale en secondes.
+        max_iterations (int): Nombre maximal de mouvements.
+        seed (int): Graine des mouvements.
+
+    Returns:
+        dict: Statistiques de la recherche (voir LocalSearch.run).
+    """
+    with tracing.active().phase("local_search", time_budget=time_budget, max_iterations=max_iterations):
+        stats = LocalSearch(instance, R, seed).run(time_budget, max_iterations)
+    tracer = tracing.active()
+    if tracer.enabled:
+        tracer.emit("local_search", **stats)
+    return stats
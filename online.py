@@ -0,0 +1,202 @@
+import dcop
+import dcop_engine
+import generator
+from schedule import CENTRAL_PLANNER, Schedule
+from validation import validate_schedule
+
+
+def schedule_quality(R):
+    """
+    Qualité d'un plan complet, affectations propres des utilisateurs exclusifs
+    comprises : (nombre de requêtes servies, récompense totale). La qualité de la
+    solution du planificateur central est R.solution_quality().
+    """
+    return len(R), sum(o.reward_o for timeline in R.timelines.values() for o, _ in timeline)
+
+
+class OnlineScheduler:
+    """
+    Planification incrémentale : les requêtes arrivent (add) ou sont annulées
+    (cancel) une à une sur un plan existant, sans tout recalculer.
+
+    Une nouvelle requête est placée par son propriétaire de façon gloutonne
+    (comme aux étapes 1 et 2 du solveur s-DCOP), sinon par le DCOP de cette seule
+    requête (étapes 4 à 6), qui ne parcourt que les satellites et fenêtres
+    exclusives de ses observations. Une requête non servie reste en attente et est
+    retentée lorsqu'une annulation libère un de ses satellites. Le coût d'un
+    événement ne dépend donc que des satellites touchés, pas de la taille du plan.
+
+    Comme dans la résolution par lot, où le planificateur central est servi avant
+    les utilisateurs exclusifs, une requête du planificateur central qui ne trouve
+    pas de place déloge les affectations propres des utilisateurs exclusifs qui la
+    bloquent ; celles-ci sont replacées ailleurs ou mises en attente.
+
+    L'ordre d'arrivée peut tout de même conduire à une solution moins bonne que la
+    résolution par lot : reconcile() relance le solveur s-DCOP sur les requêtes
+    courantes et conserve la meilleure des deux solutions.
+    """
+
+    def __init__(self, satellites, users, algorithm='dpop', backend='native', cache=None):
+        self.satellites = list(satellites)
+        self.users = list(users)
+        self.algorithm = algorithm
+        self.backend = backend
+        self.cache = cache if cache is not None else dcop_engine.SolutionCache()
+        self.exclusive_windows = generator.ExclusiveWindowIndex(self.users)
+        self.R = Schedule(self.satellites)
+        self.requests = {}
+        self._pending_by_satellite = {}
+
+    @staticmethod
+    def from_instance(instance, algorithm='dpop', backend='native', cache=None):
+        """
+        Démarre à partir de la résolution par lot d'une instance.
+        """
+        scheduler = OnlineScheduler(instance.satellites, instance.users, algorithm, backend, cache)
+        scheduler.R = dcop.s_dcop_schedule(instance, algorithm, backend, cache=scheduler.cache)
+        for task in instance.tasks:
+            scheduler.requests[task] = None
+            if not scheduler.R.is_served(task):
+                scheduler._set_pending(task)
+        return scheduler
+
+    def __len__(self):
+        return len(self.requests)
+
+    def __contains__(self, task):
+        return task in self.requests
+
+    @property
+    def pending(self):
+        return [r for r in self.requests if not self.R.is_served(r)]
+
+    def add(self, task):
+        """
+        Ajoute une requête au plan.
+
+        Args:
+            task (generator.Task): La nouvelle requête.
+
+        Returns:
+            tuple: (observation, (satellite_id, t)) si la requête est servie, None sinon.
+        """
+        if task in self.requests:
+            raise ValueError(f"La requête {task.id} est déjà planifiée")
+        self.requests[task] = None
+        self._place(task)
+        return self.R.assignment_of(task)
+
+    def cancel(self, task):
+        """
+        Annule une requête. Si elle était servie, les requêtes en attente sur son
+        satellite sont retentées, par ordre de priorité.
+
+        Returns:
+            list: Les requêtes en attente servies grâce à l'annulation.
+        """
+        if task not in self.requests:
+            raise KeyError(task.id)
+        del self.requests[task]
+        assignment = self.R.assignment_of(task)
+        if assignment is None:
+            self._clear_pending(task)
+            return []
+        satellite_id, _ = self.R.unassign(assignment[0])
+        return self._refill(satellite_id)
+
+    def solution(self):
+        return self.R.solution()
+
+    def instance(self):
+        tasks = list(self.requests)
+        return generator.Instance(self.satellites, self.users, tasks, [o for task in tasks for o in task.observation_opportunities])
+
+    def validate(self):
+        """
+        Vérifie le plan courant (voir validation.check_plan).
+
+        Returns:
+            dict: {vérification en échec: observations fautives}, vide si le plan est valide.
+        """
+        return validate_schedule(self.R, self.instance())
+
+    def reconcile(self):
+        """
+        Compare la solution courante à celle d'une résolution par lot des requêtes
+        courantes et conserve la meilleure (plus de requêtes servies, puis plus de
+        récompense), si bien que la solution est au moins aussi bonne que celle de
+        la résolution par lot.
+
+        Returns:
+            bool: True si le plan de la résolution par lot a été adopté.
+        """
+        batch = dcop.s_dcop_schedule(self.instance(), self.algorithm, self.backend, cache=self.cache)
+        if batch.solution_quality() <= self.R.solution_quality():
+            return False
+        self.R = batch
+        self._pending_by_satellite = {}
+        for task in self.pending:
+            self._set_pending(task)
+        return True
+
+    def _place(self, task):
+        # Phase gloutonne : le propriétaire de la requête la place lui-même, s'il s'agit du
+        # planificateur central ou d'un utilisateur exclusif (étapes 1 et 2 de la résolution par lot)
+        if task.user.id == CENTRAL_PLANNER or task.user.exclusive_windows:
+            for o in dcop.sort_observations(task.observation_opportunities):
+                if dcop.first_slot(o, None, self.R) is not None:
+                    return True
+        if task.user.id == CENTRAL_PLANNER and self._preempt(task):
+            return True
+        # Phase DCOP : les utilisateurs exclusifs dont les fenêtres couvrent une observation
+        dcop.solve_request_DCOP(task, None, self.R, self.exclusive_windows, self.algorithm, self.backend, self.cache)
+        if self.R.is_served(task):
+            return True
+        self._set_pending(task)
+        return False
+
+    def _preempt(self, task):
+        # Place une requête du planificateur central en délogeant des affectations propres
+        for o in dcop.sort_observations(task.observation_opportunities):
+            satellite = o.satellite_o
+            timeline = self.R[satellite.id]
+            blockers = timeline.conflicts(o.t_start_o, o.t_end_o)
+            if not all(self.R.is_private(b) for b in blockers):
+                continue
+            if self.R.remaining_capacity(satellite) + len(blockers) <= 0:
+                # Plan plein : libérer aussi l'affectation propre de plus faible récompense
+                others = [b for b, _ in timeline if self.R.is_private(b) and b not in blockers]
+                if not others:
+                    continue
+                blockers = blockers + [min(others, key=lambda b: b.reward_o)]
+
+            evicted = [(b, self.R.agent_of(b), self.R.unassign(b)) for b in blockers]
+            if dcop.first_slot(o, None, self.R) is None:
+                for b, agent_id, slot in evicted:
+                    self.R.assign(b, slot, agent_id)
+                continue
+            for r in dcop.sort_requests([b.request_o for b, _, _ in evicted]):
+                self._place(r)
+            return True
+        return False
+
+    def _refill(self, satellite_id):
+        served = []
+        # Le planificateur central d'abord, comme dans la résolution par lot
+        candidates = sorted(dcop.sort_requests(self._pending_by_satellite.get(satellite_id, ())),
+                            key=lambda r: r.user.id != CENTRAL_PLANNER)
+        for r in candidates:
+            if self.R.remaining_capacity(self.R[satellite_id].satellite) <= 0:
+                break
+            self._clear_pending(r)
+            if self._place(r):
+                served.append(r)
+        return served
+
+    def _set_pending(self, task):
+        for o in task.observation_opportunities:
+            self._pending_by_satellite.setdefault(o.satellite_o.id, set()).add(task)
+
+    def _clear_pending(self, task):
+        for o in task.observation_opportunities:
+            self._pending_by_satellite.get(o.satellite_o.id, set()).discard(task)
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import os
+import tempfile
+
+from dcop_model import DCOPModel
+
+
+class PydcopRunner:
+    """
+    Lance l'exécutable pydcop de façon asynchrone.
+
+    Chaque résolution s'exécute dans son propre répertoire temporaire, sans shell,
+    avec au plus max_concurrency processus simultanés et un délai maximal par
+    résolution. Le fichier de résultats est lu dès la fin de chaque processus.
+    executable peut être une commande complète, par exemple
+    [sys.executable, "stub_pydcop.py"] pour se passer d'une installation de pydcop.
+    """
+
+    def __init__(self, executable="pydcop", max_concurrency=4, timeout=None):
+        self.executable = executable
+        self.command = [executable] if isinstance(executable, str) else list(executable)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+    async def _solve_job(self, semaphore, dcop_problem, algorithm):
+        async with semaphore:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                if isinstance(dcop_problem, DCOPModel):
+                    dcop_problem = dcop_problem.to_yaml(os.path.join(tmp_dir, "dcop_eoscsp.yaml"))
+                output_file = os.path.join(tmp_dir, "results.json")
+                process = await asyncio.create_subprocess_exec(
+                    *self.command, "--output", output_file, "solve", "--algo", algorithm, dcop_problem,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                try:
+                    _, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"pydcop n'a pas terminé en {self.timeout}s pour '{dcop_problem}'")
+                finally:
+                    # Délai dépassé ou tâche annulée (échec d'une autre résolution de solve_many) :
+                    # le processus ne doit pas survivre à son répertoire temporaire
+                    if process.returncode is None:
+                        process.kill()
+                        await process.wait()
+                if process.returncode != 0:
+                    raise RuntimeError(f"Une erreur s'est produite lors de l'exécution de pydcop: {stderr.decode(errors='replace').strip()}")
+
+                try:
+                    with open(output_file, 'r') as f:
+                        results = json.load(f)
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"Le fichier de résultats '{output_file}' n'a pas été trouvé.")
+                return results.get("assignment", {})
+
+    async def solve_all(self, dcop_problems, algorithm='dpop'):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(*(self._solve_job(semaphore, p, algorithm) for p in dcop_problems))
+
+    def solve_many(self, dcop_problems, algorithm='dpop'):
+        """
+        Résout plusieurs DCOP indépendants en parallèle.
+
+        Args:
+            dcop_problems (list): DCOPModel ou chemins de fichiers YAML.
+            algorithm (str): Algorithme pydcop à utiliser.
+
+        Returns:
+            list: Les affectations brutes {variable: valeur}, dans l'ordre des problèmes.
+        """
+        return asyncio.run(self.solve_all(dcop_problems, algorithm))
+
+    def solve(self, dcop_problem, algorithm='dpop'):
+        return self.solve_many([dcop_problem], algorithm)[0]
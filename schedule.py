@@ -0,0 +1,90 @@
+from timeline import Timeline
+
+CENTRAL_PLANNER = "central_planner"
+
+
+class Schedule:
+    """
+    Plan global partagé par les phases du solveur s-DCOP.
+
+    Il possède le plan (Timeline) de chaque satellite et tient à jour, à chaque
+    affectation ou retrait, la requête servie par chaque observation et les
+    affectations décidées par chaque agent. Un agent est l'utilisateur qui a
+    décidé de l'affectation : le propriétaire de la requête pour les phases
+    gloutonnes, l'utilisateur exclusif qui l'accepte pour la phase DCOP.
+    """
+
+    def __init__(self, satellites):
+        self.timelines = {satellite.id: Timeline(satellite) for satellite in satellites}
+        self._slot_by_request = {}
+        self._agent_by_observation = {}
+        self._assignments_by_agent = {}
+        self._solution = {}
+        self._solution_reward = 0
+
+    def __getitem__(self, satellite_id):
+        return self.timelines[satellite_id]
+
+    def __len__(self):
+        return len(self._agent_by_observation)
+
+    def load(self, satellite_id):
+        return len(self.timelines[satellite_id])
+
+    def remaining_capacity(self, satellite):
+        return satellite.capacity - len(self.timelines[satellite.id])
+
+    def is_served(self, request):
+        return request in self._slot_by_request
+
+    def assignment_of(self, request):
+        """
+        Retourne (observation, (satellite_id, t)) pour une requête servie, None sinon.
+        """
+        return self._slot_by_request.get(request)
+
+    def agent_of(self, o):
+        return self._agent_by_observation.get(o)
+
+    def assignments(self, agent_id):
+        return self._assignments_by_agent.get(agent_id, {})
+
+    def assign(self, o, slot, agent_id):
+        satellite_id, t = slot
+        self.timelines[satellite_id].insert(o, t)
+        self._slot_by_request[o.request_o] = (o, slot)
+        self._agent_by_observation[o] = agent_id
+        self._assignments_by_agent.setdefault(agent_id, {})[o] = slot
+        # Les affectations propres d'un utilisateur exclusif restent privées
+        if agent_id == CENTRAL_PLANNER or o.user_o.id != agent_id:
+            self._solution[o] = slot
+            self._solution_reward += o.reward_o
+
+    def unassign(self, o):
+        agent_id = self._agent_by_observation.pop(o)
+        slot = self._assignments_by_agent[agent_id].pop(o)
+        self.timelines[slot[0]].remove(o)
+        if self._slot_by_request.get(o.request_o, (None,))[0] == o:
+            del self._slot_by_request[o.request_o]
+        if self._solution.pop(o, None) is not None:
+            self._solution_reward -= o.reward_o
+        return slot
+
+    def is_private(self, o):
+        """
+        Vrai pour une affectation propre d'un utilisateur exclusif, absente de solution().
+        """
+        return o in self._agent_by_observation and o not in self._solution
+
+    def solution_quality(self):
+        """
+        Qualité de solution() : (nombre de requêtes servies, récompense totale), en O(1).
+        """
+        return len(self._solution), self._solution_reward
+
+    def solution(self):
+        """
+        Solution du planificateur central : ses propres affectations et les
+        observations acceptées par les utilisateurs exclusifs pour le compte d'autrui.
+        """
+        return dict(self._solution)
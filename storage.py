@@ -0,0 +1,166 @@
+import json
+import struct
+
+import numpy as np
+
+import generator
+from columnar import ColumnarInstance, OpportunityStore
+
+# Format binaire : MAGIC, longueur de l'en-tête (uint64 little-endian), en-tête JSON,
+# puis les colonnes brutes, chacune alignée sur ALIGNMENT octets pour pouvoir être
+# projetée en mémoire (np.memmap) sans copie.
+MAGIC = b"EOSCSP\x00\x01"
+ALIGNMENT = 64
+
+INSTANCE_COLUMNS = [
+    "satellite_t_start", "satellite_t_end", "satellite_capacity", "satellite_transition_time",
+    "user_priority", "window_user", "window_satellite", "window_start", "window_end",
+    "task_user", "task_satellite", "task_t_start", "task_t_end", "task_duration", "task_reward", "task_gps",
+]
+OPPORTUNITY_COLUMNS = ["t_start", "t_end", "duration", "reward", "priority", "satellite", "request", "user", "index"]
+
+
+def _align(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_columns(path, columns, kind, meta=None):
+    """
+    Écrit des colonnes NumPy dans un fichier binaire projetable en mémoire.
+
+    Args:
+        path (str): Chemin du fichier.
+        columns (dict): Colonnes {nom: tableau}.
+        kind (str): Type de contenu ('instance', 'schedule', ...).
+        meta (dict): Métadonnées JSON libres.
+    """
+    arrays = {name: np.ascontiguousarray(column) for name, column in columns.items()}
+    header = {"kind": kind, "meta": meta if meta else {}, "columns": {}}
+    offset = 0
+    for name, array in arrays.items():
+        header["columns"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += _align(array.nbytes)
+    header_bytes = json.dumps(header).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + header["columns"][name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+
+
+def read_columns(path, mmap=True):
+    """
+    Relit un fichier écrit par write_columns.
+
+    Args:
+        path (str): Chemin du fichier.
+        mmap (bool): Si vrai, les colonnes sont projetées en mémoire en lecture seule
+            (ouverture immédiate, pages partagées entre processus) ; sinon elles sont copiées.
+
+    Returns:
+        tuple: (kind, meta, colonnes).
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' n'est pas un fichier EOSCSP binaire")
+        (header_length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_length))
+    data_start = _align(len(MAGIC) + 8 + header_length)
+
+    columns = {}
+    for name, column in header["columns"].items():
+        dtype = np.dtype(column["dtype"])
+        shape = tuple(column["shape"])
+        if 0 in shape:
+            columns[name] = np.empty(shape, dtype=dtype)
+            continue
+        array = np.memmap(path, dtype=dtype, mode="r", offset=data_start + column["offset"], shape=shape)
+        columns[name] = array if mmap else np.array(array)
+    return header["kind"], header["meta"], columns
+
+
+def save_instance(path, instance, meta=None):
+    """
+    Enregistre une instance (colonnes de l'instance et des opportunités).
+
+    Une generator.Instance est d'abord convertie (ColumnarInstance.from_instance) ;
+    ses identifiants sont conservés dans l'en-tête s'ils ne suivent pas la
+    numérotation par défaut.
+
+    Args:
+        path (str): Chemin du fichier.
+        instance (ColumnarInstance | generator.Instance): Instance à enregistrer.
+        meta (dict): Métadonnées JSON libres (graine, paramètres de génération...).
+    """
+    if isinstance(instance, generator.Instance):
+        instance = ColumnarInstance.from_instance(instance)
+    columns = {name: getattr(instance, name) for name in INSTANCE_COLUMNS}
+    for name in OPPORTUNITY_COLUMNS:
+        columns[f"opportunity_{name}"] = getattr(instance.opportunities, name)
+    meta = dict(meta) if meta else {}
+    if instance.ids:
+        meta["ids"] = instance.ids
+    write_columns(path, columns, "instance", meta)
+
+
+def load_instance(path, mmap=True):
+    """
+    Relit une instance enregistrée par save_instance, sous forme de ColumnarInstance
+    (materialize() redonne une generator.Instance).
+    """
+    kind, meta, columns = read_columns(path, mmap)
+    if kind != "instance":
+        raise ValueError(f"'{path}' contient un(e) {kind}, pas une instance")
+    # materialize(compact=True) suppose les opportunités regroupées par tâche
+    request = columns["opportunity_request"]
+    if np.any(request[1:] < request[:-1]):
+        raise ValueError(f"'{path}' : les opportunités ne sont pas regroupées par tâche")
+    opportunities = OpportunityStore(**{name: columns[f"opportunity_{name}"] for name in OPPORTUNITY_COLUMNS})
+    return ColumnarInstance(**{name: columns[name] for name in INSTANCE_COLUMNS}, opportunities=opportunities,
+                            ids=meta.get("ids"))
+
+
+def save_schedule(path, solution, instance, meta=None):
+    """
+    Enregistre une solution {observation: (satellite_id, t)} d'une instance.
+
+    Les observations, requêtes et satellites sont enregistrés par leur position
+    dans instance.observation_opportunities, instance.tasks et instance.satellites.
+    """
+    observation_index = {o: i for i, o in enumerate(instance.observation_opportunities)}
+    request_index = {task: i for i, task in enumerate(instance.tasks)}
+    satellite_index = {satellite.id: i for i, satellite in enumerate(instance.satellites)}
+    columns = {
+        "opportunity": np.array([observation_index[o] for o in solution], dtype=np.int64),
+        "request": np.array([request_index[o.request_o] for o in solution], dtype=np.int64),
+        "satellite": np.array([satellite_index[satellite_id] for satellite_id, _ in solution.values()], dtype=np.int32),
+        "start": np.array([t for _, t in solution.values()], dtype=np.float64),
+    }
+    write_columns(path, columns, "schedule", meta)
+
+
+def load_schedule(path, instance=None, mmap=True):
+    """
+    Relit une solution enregistrée par save_schedule.
+
+    Args:
+        path (str): Chemin du fichier.
+        instance (generator.Instance): Si fournie, la solution est reconstruite sous
+            la forme {observation: (satellite_id, t)} ; sinon les colonnes sont retournées.
+        mmap (bool): Projeter les colonnes en mémoire plutôt que de les copier.
+    """
+    kind, _, columns = read_columns(path, mmap)
+    if kind != "schedule":
+        raise ValueError(f"'{path}' contient un(e) {kind}, pas une solution")
+    if instance is None:
+        return columns
+    observations = instance.observation_opportunities
+    return {
+        observations[i]: (instance.satellites[s].id, t)
+        for i, s, t in zip(columns["opportunity"].tolist(), columns["satellite"].tolist(), columns["start"].tolist())
+    }
@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import dcop_engine
+from dcop_model import load_yaml
+
+STUB_PYDCOP = os.path.abspath(__file__)
+
+
+def main(argv=None):
+    """
+    Remplaçant minimal de la ligne de commande pydcop, pour les benchmarks et les
+    environnements sans pydcop : 'stub_pydcop.py --output F solve --algo A fichier.yaml'
+    résout le DCOP avec le moteur natif et écrit {"assignment": ...} dans F.
+
+    --delay (secondes) et --exit-code simulent un pydcop lent ou en échec ;
+    'stub_pydcop.py check' vérifie PydcopRunner avec ce faux exécutable.
+    """
+    parser = argparse.ArgumentParser(prog="stub_pydcop")
+    parser.add_argument("--output")
+    parser.add_argument("--delay", type=float, default=0)
+    parser.add_argument("--exit-code", type=int, default=0)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    solve = subparsers.add_parser("solve")
+    solve.add_argument("--algo", default="dpop")
+    solve.add_argument("dcop_file")
+    subparsers.add_parser("check")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        check_runner()
+        return 0
+    if args.output is None:
+        parser.error("--output est requis pour solve")
+    time.sleep(args.delay)
+    if args.exit_code:
+        print(f"échec simulé ({args.exit_code})", file=sys.stderr)
+        return args.exit_code
+
+    model = load_yaml(args.dcop_file)
+    assignment = dcop_engine.solve(model, args.algo)
+    with open(args.output, "w") as f:
+        json.dump({"assignment": assignment, "status": "FINISHED"}, f)
+    return 0
+
+
+def _running_stubs(marker):
+    # Processus du faux exécutable encore en vie dont la ligne de commande contient marker (Linux)
+    pids = []
+    if not os.path.isdir("/proc"):
+        return pids
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read().split(b"\0")
+        except OSError:
+            continue
+        if STUB_PYDCOP.encode() in cmdline and marker.encode() in cmdline:
+            pids.append(int(pid))
+    return pids
+
+
+def check_runner():
+    """
+    Vérifie PydcopRunner (sous-processus, délai maximal, erreurs, annulation) avec
+    ce faux exécutable, sur les DCOP des requêtes non servies d'une petite instance.
+    """
+    import dcop
+    import generator
+    from pydcop_runner import PydcopRunner
+    from schedule import Schedule
+
+    random.seed(0)
+    instance = generator.Instance.generate(5, 4, 20)
+    R = Schedule(instance.satellites)
+    dcop.greedy_eoscsp_solver(instance.filter_by_user("central_planner"), R)
+    problems = [dcop.build_DCOP(r.observation_opportunities, R, instance.exclusive_window_index)
+                for r in instance.tasks if not R.is_served(r)]
+    problems = [p for p in problems if p.variables][:8]
+    stub = [sys.executable, STUB_PYDCOP]
+
+    # Résolutions concurrentes : mêmes affectations que le moteur natif
+    results = PydcopRunner(stub, max_concurrency=4).solve_many(problems)
+    assert results == [dcop_engine.solve(p) for p in problems], "affectations différentes du moteur natif"
+    print(f"solve_many : {len(problems)} DCOP, mêmes affectations que le moteur natif")
+
+    # Pipeline complet : identique à la résolution native
+    assert dcop.s_dcop_eoscsp_solver(instance, backend=PydcopRunner(stub)) == dcop.s_dcop_eoscsp_solver(instance)
+    print("s_dcop_eoscsp_solver : même solution qu'avec le moteur natif")
+
+    # Délai maximal : TimeoutError et processus tué. Le délai du faux exécutable,
+    # très long, sert aussi de marqueur pour retrouver ses processus
+    marker = f"{random.random() * 1e6 + 1e6:.0f}"
+    try:
+        PydcopRunner(stub + ["--delay", marker], timeout=0.5).solve(problems[0])
+        raise AssertionError("TimeoutError attendue")
+    except TimeoutError:
+        pass
+    assert not _running_stubs(marker), "processus encore en vie après le délai"
+    print("délai : TimeoutError, processus tué")
+
+    # Code de retour non nul : RuntimeError avec la sortie d'erreur
+    try:
+        PydcopRunner(stub + ["--exit-code", "3"]).solve(problems[0])
+        raise AssertionError("RuntimeError attendue")
+    except RuntimeError as e:
+        assert "échec simulé (3)" in str(e), e
+    print("échec : RuntimeError avec la sortie d'erreur de pydcop")
+
+    # Échec d'une résolution de solve_many : les autres sont annulées et leurs processus tués
+    marker = f"{random.random() * 1e6 + 1e6:.0f}"
+    slow = PydcopRunner(stub + ["--delay", marker], max_concurrency=4)
+    failing = PydcopRunner(stub + ["--exit-code", "1"])
+
+    async def mixed():
+        semaphore = asyncio.Semaphore(4)
+        return await asyncio.gather(*(slow._solve_job(semaphore, p, "dpop") for p in problems[:3]),
+                                    failing._solve_job(semaphore, problems[3], "dpop"))
+
+    t0 = time.perf_counter()
+    try:
+        asyncio.run(mixed())
+        raise AssertionError("RuntimeError attendue")
+    except RuntimeError:
+        pass
+    assert time.perf_counter() - t0 < 30, "les résolutions restantes n'ont pas été annulées"
+    assert not _running_stubs(marker), "processus encore en vie après l'annulation"
+    print("annulation : processus des autres résolutions tués")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import bisect
+
+# Taille au-delà de laquelle un bloc est coupé en deux
+BLOCK_SIZE = 512
+
+
+class Timeline:
+    """
+    Plan d'un satellite : observations planifiées triées par date de début.
+
+    Les dates de début et de fin sont conservées dans des tableaux triés
+    parallèles, ce qui permet de trouver le premier créneau libre par dichotomie
+    au lieu de parcourir tout le plan. Ces tableaux sont découpés en blocs d'au
+    plus BLOCK_SIZE observations, indexés par la dernière date de début et de fin
+    de chaque bloc : une insertion ou un retrait ne décale que les éléments d'un
+    bloc, au lieu de tout le plan.
+    """
+
+    def __init__(self, satellite):
+        self.satellite = satellite
+        self._starts = []
+        self._ends = []
+        self._observations = []
+        # Dernière date de début et de fin de chaque bloc
+        self._last_starts = []
+        self._last_ends = []
+        self._start_by_obs = {}
+
+    def __len__(self):
+        return len(self._start_by_obs)
+
+    def __contains__(self, o):
+        return o in self._start_by_obs
+
+    def __iter__(self):
+        # Même forme que les anciennes entrées de R : (o, (satellite.id, t))
+        for observations, starts in zip(self._observations, self._starts):
+            for o, t in zip(observations, starts):
+                yield o, (self.satellite.id, t)
+
+    def start_of(self, o):
+        return self._start_by_obs.get(o)
+
+    def _locate(self, keys, last_keys, x, search):
+        # Position (bloc, indice dans le bloc) de search(keys, x) sur le tableau complet
+        b = search(last_keys, x)
+        if b == len(last_keys):
+            return b, 0
+        return b, search(keys[b], x)
+
+    def _slots_from(self, b, k):
+        for block in range(b, len(self._starts)):
+            starts, ends = self._starts[block], self._ends[block]
+            for i in range(k if block == b else 0, len(starts)):
+                yield starts[i], ends[i]
+
+    def _end_before(self, b, k):
+        if k > 0:
+            return self._ends[b][k - 1]
+        if b > 0:
+            return self._ends[b - 1][-1]
+        return None
+
+    def earliest_start(self, o):
+        """
+        Cherche la première date de début réalisable pour une observation.
+
+        La date retournée est dans [t_start_o, t_end_o - duration_o] et respecte
+        le temps de transition du satellite avec les observations voisines.
+
+        Args:
+            o (ObservationOpportunity): Opportunité d'observation à placer.
+
+        Returns:
+            float: Date de début au plus tôt, ou None si aucun créneau ne convient.
+        """
+        transition_time = self.satellite.transition_time
+        # Les créneaux situés avant la position trouvée ne laissent pas la place de l'observation
+        b, k = self._locate(self._starts, self._last_starts, o.t_start_o + o.duration_o + transition_time, bisect.bisect_left)
+        previous_end = self._end_before(b, k)
+        for start, end in self._slots_from(b, k):
+            t_start_prime = o.t_start_o
+            if previous_end is not None:
+                t_start_prime = max(o.t_start_o, previous_end + transition_time)
+            # Les fins sont triées : au-delà, plus aucun créneau ne peut convenir
+            if t_start_prime + o.duration_o > o.t_end_o:
+                return None
+            t_end_prime = t_start_prime + o.duration_o + transition_time
+            if t_start_prime < t_end_prime <= start:
+                return t_start_prime
+            previous_end = end
+
+        # Après la dernière observation du plan
+        t_start_prime = o.t_start_o
+        if previous_end is not None:
+            t_start_prime = max(o.t_start_o, previous_end + transition_time)
+        t_end_prime = t_start_prime + o.duration_o
+        if t_start_prime < t_end_prime <= o.t_end_o:
+            return t_start_prime
+        return None
+
+    def conflicts(self, t_start, t_end):
+        """
+        Observations planifiées qui empêchent d'occuper [t_start, t_end], temps de
+        transition compris.
+
+        Les observations du plan ne se chevauchant pas, leurs fins sont triées comme
+        leurs débuts : les deux bornes se trouvent par dichotomie.
+        """
+        transition_time = self.satellite.transition_time
+        bi, i = self._locate(self._ends, self._last_ends, t_start - transition_time, bisect.bisect_right)
+        bj, j = self._locate(self._starts, self._last_starts, t_end + transition_time, bisect.bisect_left)
+        if bi == bj:
+            return self._observations[bi][i:j] if bi < len(self._observations) else []
+        if bi > bj:
+            return []
+        conflicts = self._observations[bi][i:]
+        for block in range(bi + 1, bj):
+            conflicts.extend(self._observations[block])
+        if bj < len(self._observations):
+            conflicts.extend(self._observations[bj][:j])
+        return conflicts
+
+    def insert(self, o, t):
+        if not self._starts:
+            self._starts.append([t])
+            self._ends.append([t + o.duration_o])
+            self._observations.append([o])
+            self._last_starts.append(t)
+            self._last_ends.append(t + o.duration_o)
+            self._start_by_obs[o] = t
+            return
+        # Après la dernière date de début : fin du dernier bloc
+        b = min(bisect.bisect_right(self._last_starts, t), len(self._starts) - 1)
+        starts = self._starts[b]
+        i = bisect.bisect_right(starts, t)
+        starts.insert(i, t)
+        self._ends[b].insert(i, t + o.duration_o)
+        self._observations[b].insert(i, o)
+        self._start_by_obs[o] = t
+        if i == len(starts) - 1:
+            self._last_starts[b] = t
+            self._last_ends[b] = t + o.duration_o
+        if len(starts) > BLOCK_SIZE:
+            self._split(b)
+
+    def _split(self, b):
+        half = len(self._starts[b]) // 2
+        for blocks in (self._starts, self._ends, self._observations):
+            blocks.insert(b + 1, blocks[b][half:])
+            del blocks[b][half:]
+        self._last_starts.insert(b, self._starts[b][-1])
+        self._last_ends.insert(b, self._ends[b][-1])
+
+    def remove(self, o):
+        t = self._start_by_obs.pop(o)
+        b, i = self._locate(self._starts, self._last_starts, t, bisect.bisect_left)
+        while self._observations[b][i] != o:
+            i += 1
+            if i == len(self._observations[b]):
+                b, i = b + 1, 0
+        starts = self._starts[b]
+        del starts[i]
+        del self._ends[b][i]
+        del self._observations[b][i]
+        if not starts:
+            for blocks in (self._starts, self._ends, self._observations, self._last_starts, self._last_ends):
+                del blocks[b]
+        elif i == len(starts):
+            self._last_starts[b] = starts[-1]
+            self._last_ends[b] = self._ends[b][-1]
+        return t
@@ -0,0 +1,127 @@
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+_NULL_CONTEXT = nullcontext()
+
+
+class NullTracer:
+    """
+    Traceur inactif (par défaut) : chaque appel est un no-op. Le code instrumenté
+    teste tracer.enabled avant de construire un événement coûteux.
+    """
+
+    enabled = False
+
+    def emit(self, event, **fields):
+        pass
+
+    def phase(self, name, **fields):
+        return _NULL_CONTEXT
+
+    def count(self, name, n=1):
+        pass
+
+
+class Tracer:
+    """
+    Enregistre les événements d'une résolution sous forme de lignes JSON (JSONL).
+
+    Chaque événement porte son nom ("event") et l'instant de son émission ("t", en
+    secondes depuis la création du traceur). phase() mesure la durée d'un bloc et
+    count() accumule des compteurs, écrits par flush_counters() dans un événement
+    "counters".
+
+    Args:
+        sink (str | file | list): Chemin du fichier JSONL, fichier ouvert en écriture,
+            ou liste à laquelle les événements (dict) sont ajoutés.
+    """
+
+    enabled = True
+
+    def __init__(self, sink=None):
+        self.counters = Counter()
+        self._t0 = time.perf_counter()
+        self._owned = isinstance(sink, str)
+        self._sink = open(sink, "w") if self._owned else (sink if sink is not None else [])
+
+    @property
+    def events(self):
+        return self._sink if isinstance(self._sink, list) else None
+
+    def emit(self, event, **fields):
+        record = {"event": event, "t": round(time.perf_counter() - self._t0, 6), **fields}
+        if isinstance(self._sink, list):
+            self._sink.append(record)
+        else:
+            self._sink.write(json.dumps(record, default=str) + "\n")
+
+    @contextmanager
+    def phase(self, name, **fields):
+        t0 = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.emit("phase", name=name, duration=time.perf_counter() - t0, **fields)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def flush_counters(self):
+        if self.counters:
+            self.emit("counters", **self.counters)
+            self.counters.clear()
+
+    def close(self):
+        self.flush_counters()
+        if self._owned:
+            self._sink.close()
+
+
+_active = NullTracer()
+
+
+def active():
+    return _active
+
+
+def reset_worker():
+    """
+    Désactive le traceur hérité par un processus de travail (initializer de
+    ProcessPoolExecutor) : sous fork, le processus fils reçoit une copie du
+    traceur actif et de son tampon, dont les événements seraient perdus ou
+    écrits en double dans le fichier du parent. Le traceur hérité n'est pas
+    fermé, le fichier appartenant au processus parent.
+    """
+    global _active
+    _active = NullTracer()
+
+
+@contextmanager
+def tracing(sink=None):
+    """
+    Active un Tracer pour la durée du bloc.
+
+        with tracing("trace.jsonl"):
+            s_dcop_eoscsp_solver(instance)
+
+    Le traceur n'est actif que dans le processus courant : les processus de
+    travail de solve_DCOP_components le désactivent au démarrage (reset_worker)
+    et ne sont pas tracés en détail, seul un événement dcop_component
+    (requêtes, placements, cache) résume chacun.
+
+    Args:
+        sink (str | file | list): Destination des événements (voir Tracer).
+
+    Returns:
+        Tracer: Le traceur actif.
+    """
+    global _active
+    previous = _active
+    tracer = _active = Tracer(sink)
+    try:
+        yield tracer
+    finally:
+        _active = previous
+        tracer.close()
@@ -0,0 +1,177 @@
+import numpy as np
+
+# Agent d'une affectation : l'indice de l'utilisateur qui l'a décidée, ou
+OWNER = -1      # le propriétaire de la requête (phases gloutonnes)
+DELEGATED = -2  # un utilisateur exclusif autre que le propriétaire, non précisé (solution du planificateur central)
+
+
+def check_plan(satellite, start, observation_satellite, t_start_o, t_end_o, duration, request, user, agent,
+               satellite_capacity, satellite_transition_time, window_satellite, window_start, window_end, window_user,
+               tolerance=1e-9):
+    """
+    Vérifie un plan décrit par des colonnes, une ligne par observation planifiée.
+
+    Toutes les vérifications sont des opérations vectorisées sur des tableaux triés.
+    Une observation dont l'agent n'est pas le propriétaire doit chevaucher, sur son
+    satellite, une fenêtre exclusive de cet agent (comme dans build_DCOP).
+
+    Args:
+        satellite (np.ndarray): Indice du satellite de l'affectation.
+        start (np.ndarray): Date de début de l'affectation.
+        observation_satellite, t_start_o, t_end_o, duration, request, user (np.ndarray):
+            Satellite, fenêtre, durée, requête et propriétaire de l'observation.
+        agent (np.ndarray): Indice de l'utilisateur qui a décidé l'affectation, OWNER ou DELEGATED.
+        satellite_capacity, satellite_transition_time (np.ndarray): Par satellite.
+        window_satellite, window_start, window_end, window_user (np.ndarray): Fenêtres
+            exclusives, disjointes sur un même satellite.
+        tolerance (float): Tolérance des comparaisons de dates.
+
+    Returns:
+        dict: {vérification en échec: indices des lignes fautives}, vide si le plan est valide.
+    """
+    n = len(start)
+    violations = {}
+
+    def report(name, rows):
+        if len(rows):
+            violations[name] = np.sort(rows)
+
+    report("satellite", np.flatnonzero(satellite != observation_satellite))
+    report("window", np.flatnonzero((start < t_start_o - tolerance) | (start + duration > t_end_o + tolerance)))
+
+    # Transitions et capacité : plan de chaque satellite trié par date de début
+    order = np.lexsort((start, satellite))
+    sorted_satellite = satellite[order]
+    same = sorted_satellite[1:] == sorted_satellite[:-1]
+    previous = order[:-1]
+    gap = start[order[1:]] - (start[previous] + duration[previous] + satellite_transition_time[sorted_satellite[:-1]])
+    report("transition", order[1:][same & (gap < -tolerance)])
+    first = np.flatnonzero(np.concatenate(([True], ~same))) if n else np.empty(0, dtype=np.int64)
+    rank = np.arange(n) - np.repeat(first, np.diff(np.append(first, n)))
+    report("capacity", order[rank >= satellite_capacity[sorted_satellite]])
+
+    order = np.argsort(request, kind="stable")
+    report("request", order[1:][request[order[1:]] == request[order[:-1]]])
+
+    report("ownership", _ownership_violations(observation_satellite, t_start_o, t_end_o, user, agent,
+                                              window_satellite, window_start, window_end, window_user))
+    return violations
+
+
+def _ownership_violations(satellite, t_start_o, t_end_o, user, agent, window_satellite, window_start, window_end, window_user):
+    rows = np.flatnonzero((agent != OWNER) & (agent != user))
+    if not len(rows):
+        return rows
+    if not len(window_start):
+        return rows
+
+    # Clé composite satellite * span + date : les fenêtres d'un satellite étant disjointes,
+    # leurs débuts et leurs fins sont triés dans le même ordre
+    base = min(window_start.min(), t_start_o[rows].min())
+    span = max(window_end.max(), t_end_o[rows].max()) - base + 1
+    order = np.lexsort((window_start, window_satellite))
+    key_start = window_satellite[order] * span + (window_start[order] - base)
+    key_end = window_satellite[order] * span + (window_end[order] - base)
+    observation_offset = satellite[rows] * span - base
+    # Fenêtres qui chevauchent ]t_start_o, t_end_o[ : fin > t_start_o et début < t_end_o
+    lo = np.searchsorted(key_end, observation_offset + t_start_o[rows], side="right")
+    hi = np.searchsorted(key_start, observation_offset + t_end_o[rows], side="left")
+    count = np.maximum(hi - lo, 0)
+
+    group = np.repeat(np.arange(len(rows)), count)
+    window = order[np.repeat(lo, count) + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)]
+    row_agent = agent[rows][group]
+    match = np.where(row_agent >= 0, window_user[window] == row_agent, window_user[window] != user[rows][group])
+    covered = np.bincount(group[match], minlength=len(rows)) > 0
+    return rows[~covered]
+
+
+def validate_columns(instance, opportunity, satellite, start, agent=None, tolerance=1e-9):
+    """
+    Vérifie un plan d'une ColumnarInstance sans créer d'objet par observation.
+
+    Args:
+        instance (ColumnarInstance): Instance planifiée.
+        opportunity (np.ndarray): Indice de chaque observation planifiée dans instance.opportunities.
+        satellite (np.ndarray): Indice du satellite de chaque affectation.
+        start (np.ndarray): Date de début de chaque affectation.
+        agent (np.ndarray): Utilisateur qui a décidé chaque affectation (défaut : le propriétaire).
+
+    Returns:
+        dict: Voir check_plan.
+    """
+    store = instance.opportunities
+    opportunity = np.asarray(opportunity)
+    if agent is None:
+        agent = np.full(len(opportunity), OWNER)
+    return check_plan(
+        np.asarray(satellite), np.asarray(start),
+        store.satellite[opportunity], store.t_start[opportunity], store.t_end[opportunity],
+        store.duration[opportunity], store.request[opportunity], store.user[opportunity], np.asarray(agent),
+        instance.satellite_capacity, instance.satellite_transition_time,
+        instance.window_satellite, instance.window_start, instance.window_end, instance.window_user,
+        tolerance,
+    )
+
+
+def validate_solution(solution, instance, agents=None, tolerance=1e-9):
+    """
+    Vérifie une solution {observation: (satellite_id, t)} d'une generator.Instance.
+
+    Args:
+        solution (dict): Affectations à vérifier.
+        instance (generator.Instance): Instance résolue.
+        agents (dict): Utilisateur (id) qui a décidé chaque affectation. Par défaut,
+            une observation d'un utilisateur exclusif est supposée acceptée pour le
+            compte d'autrui, comme dans la solution du planificateur central.
+
+    Returns:
+        dict: {vérification en échec: observations fautives}, vide si la solution est valide.
+    """
+    satellite_index = {s.id: i for i, s in enumerate(instance.satellites)}
+    user_index = {u.id: i for i, u in enumerate(instance.users)}
+    request_index = {}
+    observations = list(solution)
+    slots = list(solution.values())
+    owners = np.array([user_index[o.user_o.id] for o in observations], dtype=np.int64)
+    if agents is None:
+        central = user_index.get("central_planner", -1)
+        agent = np.where(owners == central, OWNER, DELEGATED)
+    else:
+        agent = np.array([user_index[agents[o]] for o in observations], dtype=np.int64)
+
+    windows = [(satellite_index[satellite_id], start, end, u)
+               for u, user in enumerate(instance.users) for satellite_id, start, end in user.exclusive_windows]
+    window_satellite, window_start, window_end, window_user = (
+        np.array(column, dtype=dtype) for column, dtype in zip(zip(*windows), (np.int64, float, float, np.int64))
+    ) if windows else (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), np.empty(0, dtype=np.int64))
+
+    violations = check_plan(
+        np.array([satellite_index[satellite_id] for satellite_id, _ in slots], dtype=np.int64),
+        np.array([t for _, t in slots], dtype=float),
+        np.array([satellite_index[o.satellite_o.id] for o in observations], dtype=np.int64),
+        np.array([o.t_start_o for o in observations], dtype=float),
+        np.array([o.t_end_o for o in observations], dtype=float),
+        np.array([o.duration_o for o in observations], dtype=float),
+        np.array([request_index.setdefault(o.request_o, len(request_index)) for o in observations], dtype=np.int64),
+        owners, agent,
+        np.array([s.capacity for s in instance.satellites]),
+        np.array([s.transition_time for s in instance.satellites], dtype=float),
+        window_satellite, window_start, window_end, window_user,
+        tolerance,
+    )
+    return {name: [observations[i] for i in rows.tolist()] for name, rows in violations.items()}
+
+
+def validate_schedule(R, instance, tolerance=1e-9):
+    """
+    Vérifie le plan complet d'un Schedule, avec l'agent de chaque affectation.
+    """
+    solution = {o: slot for timeline in R.timelines.values() for o, slot in timeline}
+    return validate_solution(solution, instance, {o: R.agent_of(o) for o in solution}, tolerance)
+
+
+def raise_if_invalid(violations):
+    if violations:
+        summary = ", ".join(f"{name} ({len(rows)})" for name, rows in violations.items())
+        raise ValueError(f"Plan invalide : {summary}")